@@ -0,0 +1,128 @@
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+from db_core import DBCore
+from storage import STORAGE_ENGINES
+
+
+def make_core(work_dir: str) -> DBCore:
+    for folder in ('data', 'structure'):
+        shutil.copytree(os.path.join(ROOT_DIR, folder, 'system'), os.path.join(work_dir, folder, 'system'))
+
+    core = DBCore()
+    core.DATA_DIR = os.path.join(work_dir, 'data')
+    core.STRUCTURE_DIR = os.path.join(work_dir, 'structure')
+    with redirect_stdout(io.StringIO()):
+        core.load_db()
+        core.create_database('bench')
+        core.use_db('bench')
+    return core
+
+
+def bench_bulk_insert(sizes: list, batch: int) -> list:
+    results = []
+    for size in sizes:
+        work_dir = tempfile.mkdtemp(prefix='sgbdr_bench_')
+        try:
+            core = make_core(work_dir)
+            with redirect_stdout(io.StringIO()):
+                core.create_table('items', ['id:integer:pk', 'label:string'])
+            core._write_data('items', [{"id": str(i), "label": "x"} for i in range(size)])
+
+            values = [f"{size + i}:y" for i in range(batch)]
+            start = time.perf_counter()
+            core.insert_data('items', values, True)
+            elapsed = time.perf_counter() - start
+
+            results.append({"rows": size, "batch": batch, "seconds": elapsed})
+        finally:
+            STORAGE_ENGINES["log"].wait()
+            shutil.rmtree(work_dir)
+    return results
+
+
+def bench_range_select(size: int, selectivity: float) -> dict:
+    work_dir = tempfile.mkdtemp(prefix='sgbdr_bench_')
+    try:
+        core = make_core(work_dir)
+        with redirect_stdout(io.StringIO()):
+            core.create_table('items', ['id:integer:pk', 'value:integer'])
+        core._write_data('items', [{"id": i, "value": i} for i in range(size)])
+
+        bound = int(size * (1 - selectivity))
+        condition = [f"value:>=:{bound}"]
+        timings = {}
+        for label in ('scan', 'index'):
+            if label == 'index':
+                with redirect_stdout(io.StringIO()):
+                    core.create_index('items_value', 'items', 'value')
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                core.select_data('items', condition, 'id')
+            timings[label] = time.perf_counter() - start
+
+        return {"rows": size, "matching": size - bound, **timings}
+    finally:
+        STORAGE_ENGINES["log"].wait()
+        shutil.rmtree(work_dir)
+
+
+def bench_delete_update(sizes: list) -> list:
+    results = []
+    for size in sizes:
+        rows = [{"id": i, "flag": str(i % 2)} for i in range(size)]
+        timings = {"rows": size}
+        for label in ('delete', 'update'):
+            work_dir = tempfile.mkdtemp(prefix='sgbdr_bench_')
+            try:
+                core = make_core(work_dir)
+                with redirect_stdout(io.StringIO()):
+                    core.create_table('items', ['id:integer:pk', 'flag:string'])
+                core._write_data('items', [dict(row) for row in rows])
+
+                start = time.perf_counter()
+                if label == 'delete':
+                    core.delete_data('items', ['flag:==:1'])
+                else:
+                    core.update_data('items', 'flag=2', ['flag:==:1'])
+                timings[label] = time.perf_counter() - start
+            finally:
+                STORAGE_ENGINES["log"].wait()
+                shutil.rmtree(work_dir)
+        results.append(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks DBCore.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--range-size', type=int, default=100000)
+    parser.add_argument('--selectivity', type=float, default=0.001)
+    parser.add_argument('--dml-sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'batch':>8} {'seconds':>10}")
+    for result in bench_bulk_insert(args.sizes, args.batch):
+        print(f"{result['rows']:>10} {result['batch']:>8} {result['seconds']:>10.4f}")
+
+    result = bench_range_select(args.range_size, args.selectivity)
+    print(f"\n{'rows':>10} {'matching':>8} {'scan':>10} {'index':>10}")
+    print(f"{result['rows']:>10} {result['matching']:>8} {result['scan']:>10.4f} {result['index']:>10.4f}")
+
+    print(f"\n{'rows':>10} {'delete':>10} {'update':>10}")
+    for result in bench_delete_update(args.dml_sizes):
+        print(f"{result['rows']:>10} {result['delete']:>10.4f} {result['update']:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
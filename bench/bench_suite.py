@@ -0,0 +1,187 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from bench_db_core import ROOT_DIR, make_core
+from storage import STORAGE_ENGINES
+
+
+FIELDS = ['id:integer:pk:auto', 'value:integer', 'label:string']
+CHUNK = 10000
+DEFAULT_OUTPUT = os.path.join(ROOT_DIR, 'bench_output.txt')
+
+
+def summarize(timings: list, operations: int = 1) -> dict:
+    median = statistics.median(timings)
+    result = {
+        "runs": len(timings),
+        "operations_per_run": operations,
+        "min": min(timings),
+        "median": median,
+        "max": max(timings),
+        "ops_per_second": operations / median if median else None,
+    }
+    if len(timings) >= 20:
+        result["p95"] = statistics.quantiles(timings, n=20)[-1]
+    return result
+
+
+def measure(function, runs: int) -> list:
+    timings = []
+    for run in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        function(run)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def generate_rows(size: int) -> list:
+    return [
+        [f":{i % 1000}:label{i % 7}" for i in range(start, min(start + CHUNK, size))]
+        for start in range(0, size, CHUNK)
+    ]
+
+
+def bench_size(size: int, storage: str, repeat: int, singles: int, serials: int, uses: int) -> dict:
+    work_dir = tempfile.mkdtemp(prefix='sgbdr_bench_')
+    operations = {}
+    try:
+        core = make_core(work_dir)
+        with open(os.devnull, 'w') as null, redirect_stdout(null):
+            core.set_storage(storage)
+            core.create_table('items', FIELDS)
+            data_path = core._get_data_path('items')
+
+            chunks = generate_rows(size)
+            gc.collect()
+            start = time.perf_counter()
+            for chunk in chunks:
+                core.insert_data('items', chunk, True)
+            operations["insert_bulk"] = summarize([time.perf_counter() - start], size)
+            del chunks
+
+            operations["insert_single"] = summarize(
+                measure(lambda run: core.insert_data('items', [f":{run % 1000}:single"], True), singles)
+            )
+
+            def select_cold(run):
+                core.cache.invalidate(data_path)
+                core.select_data('items', '', '*')
+
+            operations["select_all_cold"] = summarize(measure(select_cold, repeat), size)
+            operations["select_all"] = summarize(measure(lambda run: core.select_data('items', '', '*'), repeat), size)
+            operations["select_where_scan"] = summarize(
+                measure(lambda run: core.select_data('items', ['value:==:42'], '*'), repeat)
+            )
+            operations["select_where_pk"] = summarize(
+                measure(lambda run: core.select_data('items', [f'id:==:{size // 2 + run}'], '*'), repeat)
+            )
+            operations["update"] = summarize(
+                measure(lambda run: core.update_data('items', f'label=updated{run}', ['value:==:7']), repeat)
+            )
+            operations["delete"] = summarize(
+                measure(lambda run: core.delete_data('items', [f'value:==:{100 + run}']), repeat)
+            )
+            operations["get_serial_id"] = summarize(measure(lambda run: core.get_serial_id('items'), serials))
+            operations["use"] = summarize(measure(lambda run: core.use_db('bench'), uses))
+
+            STORAGE_ENGINES["log"].wait()
+            file_size = os.path.getsize(data_path)
+    finally:
+        STORAGE_ENGINES["log"].wait()
+        shutil.rmtree(work_dir)
+
+    return {"rows": size, "file_bytes": file_size, "operations": operations}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    previous = {result["rows"]: result["operations"] for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        for name, timing in result["operations"].items():
+            old = previous.get(result["rows"], {}).get(name)
+            if old is None or not old["median"]:
+                continue
+            ratio = timing["median"] / old["median"]
+            if ratio > 1 + tolerance:
+                regressions.append({"rows": result["rows"], "operation": name, "baseline": old["median"],
+                                    "median": timing["median"], "ratio": ratio})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks DBCore, résultats en JSON.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--storage', choices=sorted(STORAGE_ENGINES), default='log')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--singles', type=int, default=200, help="Nombre d'INSERT d'une seule ligne.")
+    parser.add_argument('--serials', type=int, default=200, help="Nombre d'appels à get_serial_id.")
+    parser.add_argument('--uses', type=int, default=100, help="Nombre de USE mesurés.")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Fichier JSON de sortie ('-' pour la sortie standard).")
+    parser.add_argument('--baseline', help="Rapport JSON précédent à comparer.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Ralentissement toléré par rapport à la référence.")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "storage": args.storage,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": [],
+    }
+
+    print(f"{'rows':>10} {'operation':<18} {'median (ms)':>12} {'ops/s':>12}", file=sys.stderr)
+    for size in args.sizes:
+        result = bench_size(size, args.storage, args.repeat, args.singles, args.serials, args.uses)
+        report["results"].append(result)
+        for name, timing in result["operations"].items():
+            print(f"{size:>10} {name:<18} {timing['median'] * 1000:>12.3f} {timing['ops_per_second'] or 0:>12.0f}",
+                  file=sys.stderr)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.tolerance)
+        for regression in report["regressions"]:
+            print(f"Régression : {regression['operation']} sur {regression['rows']} lignes, "
+                  f"x{regression['ratio']:.2f} ({regression['baseline'] * 1000:.3f} -> {regression['median'] * 1000:.3f} ms)",
+                  file=sys.stderr)
+        status = 1 if report["regressions"] else 0
+
+    payload = json.dumps(report, indent=4)
+    if args.output == '-':
+        print(payload)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload + "\n")
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
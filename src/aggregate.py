@@ -0,0 +1,175 @@
+import re
+
+
+AGGREGATE_PATTERN = re.compile(r'^(COUNT|SUM|AVG|MIN|MAX)\((\*|[^()]+)\)$', re.IGNORECASE)
+
+NUMERIC_COLUMN_TYPES = ('integer', 'float')
+
+
+def _to_number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Valeur non numérique : {value}")
+
+
+class SelectItem:
+    def __init__(self, label: str, function: str = None, column: str = None):
+        self.label = label
+        self.function = function
+        self.column = column
+
+
+def parse_select_list(columns: str, column_names: list) -> list:
+    items = []
+    for token in columns.split(","):
+        match = AGGREGATE_PATTERN.match(token)
+        if match is None:
+            if token not in column_names:
+                raise KeyError(f"Colonne inconnue : {token}")
+            items.append(SelectItem(token, column=token))
+            continue
+
+        function, column = match.group(1).upper(), match.group(2)
+        if column == "*":
+            if function != "COUNT":
+                raise ValueError(f"{function}(*) n'est pas supporté, précisez une colonne.")
+            column = None
+        elif column not in column_names:
+            raise KeyError(f"Colonne inconnue : {column}")
+        items.append(SelectItem(f"{function}({match.group(2)})", function, column))
+    return items
+
+
+def has_aggregate(items: list) -> bool:
+    return any(item.function for item in items)
+
+
+class Aggregation:
+    def __init__(self, items: list, group_by: str, schema: dict):
+        types = {field['column']: field['type'] for field in schema.get('fields', [])}
+        if group_by is not None and group_by not in types:
+            raise KeyError(f"Colonne inconnue : {group_by}")
+        for item in items:
+            if item.function is None and item.column != group_by:
+                raise ValueError(f"La colonne {item.column} doit figurer dans GROUP BY ou dans une fonction d'agrégat.")
+
+        self.items = items
+        self.group_by = group_by
+        self.aggregates = [item for item in items if item.function]
+        self.numeric = [
+            item.function in ('SUM', 'AVG') or types.get(item.column) in NUMERIC_COLUMN_TYPES
+            for item in self.aggregates
+        ]
+        self.groups = {}
+
+    def _new_state(self) -> list:
+        return [[0, None] for _ in self.aggregates]
+
+    def feed(self, records) -> int:
+        group_by = self.group_by
+        groups = self.groups
+        plan = list(zip(self.aggregates, self.numeric))
+        scanned = 0
+        for record in records:
+            scanned += 1
+            key = record.get(group_by) if group_by is not None else None
+            states = groups.get(key)
+            if states is None:
+                states = groups[key] = self._new_state()
+
+            for state, (item, numeric) in zip(states, plan):
+                if item.column is None:
+                    state[0] += 1
+                    continue
+                value = record.get(item.column)
+                if value is None:
+                    continue
+                if numeric:
+                    value = _to_number(value)
+                state[0] += 1
+                if item.function == 'COUNT':
+                    continue
+                current = state[1]
+                if current is None:
+                    state[1] = value
+                elif item.function in ('SUM', 'AVG'):
+                    state[1] = current + value
+                elif item.function == 'MIN':
+                    if value < current:
+                        state[1] = value
+                elif value > current:
+                    state[1] = value
+        return scanned
+
+    def feed_columns(self, gather, positions: list):
+        if self.group_by is None:
+            partitions = {None: positions}
+        else:
+            partitions = {}
+            for key, pos in zip(gather(self.group_by, positions), positions):
+                bucket = partitions.get(key)
+                if bucket is None:
+                    partitions[key] = [pos]
+                else:
+                    bucket.append(pos)
+
+        gathered = {}
+        for key, group_positions in partitions.items():
+            states = self.groups.get(key)
+            if states is None:
+                states = self.groups[key] = self._new_state()
+
+            for state, item, numeric in zip(states, self.aggregates, self.numeric):
+                if item.column is None:
+                    state[0] += len(group_positions)
+                    continue
+
+                if self.group_by is None:
+                    values = gathered.get(item.column)
+                    if values is None:
+                        values = gathered[item.column] = [value for value in gather(item.column, positions) if value is not None]
+                else:
+                    values = [value for value in gather(item.column, group_positions) if value is not None]
+                if not values:
+                    continue
+                if numeric:
+                    values = list(map(_to_number, values))
+
+                state[0] += len(values)
+                if item.function in ('SUM', 'AVG'):
+                    partial = sum(values)
+                    state[1] = partial if state[1] is None else state[1] + partial
+                elif item.function == 'MIN':
+                    partial = min(values)
+                    state[1] = partial if state[1] is None else min(state[1], partial)
+                elif item.function == 'MAX':
+                    partial = max(values)
+                    state[1] = partial if state[1] is None else max(state[1], partial)
+
+    def results(self) -> list:
+        if self.group_by is None and not self.groups:
+            self.groups[None] = self._new_state()
+
+        rows = []
+        for key, states in self.groups.items():
+            row = {}
+            values = iter(states)
+            for item in self.items:
+                if item.function is None:
+                    row[item.label] = key
+                    continue
+                count, value = next(values)
+                if item.function == 'COUNT':
+                    value = count
+                elif item.function == 'AVG' and count:
+                    value = value / count
+                row[item.label] = value
+            rows.append(row)
+        return rows
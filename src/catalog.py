@@ -0,0 +1,201 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+from locks import TABLE_LOCKS
+from wal import TMP_SUFFIX, fsync_directory
+
+
+CATALOG_FILE = "catalog.json"
+SETTINGS_FILE = "database.json"
+SCHEMA_SUFFIX = "_schema.json"
+INDEX_SUFFIX = "_index.json"
+
+
+class LazySchemas(Mapping):
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.loaded = {}
+
+    def __contains__(self, table_name) -> bool:
+        if table_name in self.catalog.tables:
+            return True
+        self.catalog.refresh()
+        if table_name not in self.catalog.tables and os.path.exists(self.catalog.schema_path(table_name)):
+            self.catalog.put_table(table_name)
+        return table_name in self.catalog.tables
+
+    def __getitem__(self, table_name: str) -> dict:
+        schema = self.loaded.get(table_name)
+        if schema is not None:
+            return schema
+        if table_name not in self:
+            raise KeyError(table_name)
+
+        with self.catalog.mutex:
+            schema = self.loaded.get(table_name)
+            if schema is None:
+                with open(self.catalog.schema_path(table_name), 'r', encoding='utf-8') as f:
+                    schema = json.load(f)
+                self.loaded[table_name] = schema
+            return schema
+
+    def __iter__(self):
+        return iter(list(self.catalog.tables))
+
+    def __len__(self) -> int:
+        return len(self.catalog.tables)
+
+
+class Catalog:
+    def __init__(self, directory: str, lock_path: str, timeout: float = 10.0):
+        self.directory = directory
+        self.path = os.path.join(directory, CATALOG_FILE)
+        self.settings_path = os.path.join(directory, SETTINGS_FILE)
+        self.lock = TABLE_LOCKS.get(lock_path)
+        self.timeout = timeout
+        self.mutex = threading.RLock()
+        self.stamp = None
+        self.version = 0
+        self.tables = {}
+        self.indexes = {}
+        self.settings = {}
+        self.schemas = LazySchemas(self)
+
+    def schema_path(self, table_name: str) -> str:
+        return os.path.join(self.directory, f"{table_name}{SCHEMA_SUFFIX}")
+
+    def _stamp(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    @contextmanager
+    def _locked(self):
+        self.lock.acquire(True, self.timeout)
+        try:
+            yield
+        finally:
+            self.lock.release(True)
+
+    def refresh(self) -> bool:
+        stamp = self._stamp()
+        if stamp is not None and stamp == self.stamp:
+            return False
+
+        with self.mutex:
+            if stamp is None:
+                if not os.path.isdir(self.directory):
+                    self._apply({"version": 0, "tables": {}, "indexes": {}, "settings": {}}, None)
+                    return True
+                with self._locked():
+                    if self._stamp() is None:
+                        self._write(self._scan())
+            data = self._read()
+            if data["settings"] and not os.path.exists(self.settings_path):
+                with self._locked():
+                    self._write(data["settings"], self.settings_path)
+            self._apply(data, self._stamp())
+        return True
+
+    def _scan(self) -> dict:
+        data = {"version": 1, "tables": {}, "indexes": {}, "settings": {}}
+        if os.path.exists(self.settings_path):
+            with open(self.settings_path, 'r', encoding='utf-8') as f:
+                data["settings"] = json.load(f)
+        for filename in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, filename)
+            if filename.endswith(SCHEMA_SUFFIX):
+                data["tables"][filename[:-len(SCHEMA_SUFFIX)]] = 1
+            elif filename.endswith(INDEX_SUFFIX):
+                with open(path, 'r', encoding='utf-8') as f:
+                    index_def = json.load(f)
+                data["indexes"][index_def["name"]] = index_def
+        return data
+
+    def _read(self) -> dict:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, data: dict, path: str = None):
+        path = path or self.path
+        tmp_path = path + TMP_SUFFIX
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        fsync_directory(self.directory)
+
+    def _apply(self, data: dict, stamp):
+        tables = data["tables"]
+        self.schemas.loaded = {
+            table_name: schema for table_name, schema in self.schemas.loaded.items()
+            if tables.get(table_name) == self.tables.get(table_name)
+        }
+        self.version = data["version"]
+        self.tables = tables
+        self.indexes = data["indexes"]
+        self.settings = data["settings"]
+        self.stamp = stamp
+
+    def _update(self, change):
+        with self.mutex, self._locked():
+            data = self._read() if self._stamp() is not None else self._scan()
+            data["version"] += 1
+            change(data)
+            self._write(data)
+            self._apply(data, self._stamp())
+
+    def put_table(self, table_name: str):
+        def change(data):
+            data["tables"][table_name] = data["version"]
+        self._update(change)
+
+    def drop_table(self, table_name: str):
+        def change(data):
+            data["tables"].pop(table_name, None)
+            data["indexes"] = {
+                name: index_def for name, index_def in data["indexes"].items() if index_def["table"] != table_name
+            }
+        self._update(change)
+
+    def put_index(self, index_def: dict):
+        def change(data):
+            data["indexes"][index_def["name"]] = index_def
+        self._update(change)
+
+    def drop_index(self, index_name: str):
+        def change(data):
+            data["indexes"].pop(index_name, None)
+        self._update(change)
+
+    def set_setting(self, key: str, value):
+        def change(data):
+            data["settings"][key] = value
+            self._write(data["settings"], self.settings_path)
+        self._update(change)
+
+
+class CatalogManager:
+    def __init__(self):
+        self.mutex = threading.Lock()
+        self.catalogs = {}
+
+    def get(self, directory: str, lock_path: str) -> Catalog:
+        directory = os.path.abspath(directory)
+        with self.mutex:
+            catalog = self.catalogs.get(directory)
+            created = catalog is None
+            if created:
+                catalog = self.catalogs[directory] = Catalog(directory, lock_path)
+        if created:
+            catalog.refresh()
+        return catalog
+
+
+CATALOGS = CatalogManager()
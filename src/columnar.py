@@ -0,0 +1,147 @@
+import sys
+from array import array
+from itertools import compress, repeat
+
+from predicate import OPERATORS, NUMERIC_TYPES, typed_target
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+TYPECODES = {
+    'integer': 'q',
+    'float': 'd',
+    'boolean': 'b',
+}
+
+INT64_MIN = -(2 ** 63)
+INT64_MAX = 2 ** 63 - 1
+
+
+def _is_native(value, column_type: str) -> bool:
+    if column_type == 'integer':
+        return type(value) is int and INT64_MIN <= value <= INT64_MAX
+    if column_type == 'float':
+        return type(value) is float
+    if column_type == 'boolean':
+        return type(value) is bool
+    return False
+
+
+class ColumnarTable:
+    def __init__(self, column_names: list):
+        self.column_names = column_names
+        self.types = {}
+        self.columns = {}
+        self.nulls = {}
+        self.length = 0
+
+    @classmethod
+    def from_records(cls, schema: dict, records: list):
+        fields = schema.get('fields', [])
+        column_names = [field['column'] for field in fields]
+        expected = set(column_names)
+        for record in records:
+            if record.keys() != expected:
+                return None
+
+        table = cls(column_names)
+        table.length = len(records)
+        for field in fields:
+            column, column_type = field['column'], field['type']
+            table.types[column] = column_type
+            values = [record[column] for record in records]
+            typecode = TYPECODES.get(column_type)
+
+            if typecode and all(value is None or _is_native(value, column_type) for value in values):
+                nulls = bytearray(value is None for value in values)
+                table.columns[column] = array(typecode, (0 if value is None else value for value in values))
+                table.nulls[column] = nulls if any(nulls) else None
+            else:
+                table.columns[column] = [sys.intern(value) if type(value) is str else value for value in values]
+                table.nulls[column] = None
+
+        return table
+
+    def __len__(self) -> int:
+        return self.length
+
+    def gather(self, column: str, positions) -> list:
+        values = self.columns[column]
+        gathered = list(map(values.__getitem__, positions))
+        if type(values) is array and values.typecode == 'b':
+            gathered = list(map(bool, gathered))
+
+        nulls = self.nulls[column]
+        if nulls is not None:
+            for i, pos in enumerate(positions):
+                if nulls[pos]:
+                    gathered[i] = None
+        return gathered
+
+    def rows(self, positions, chunk_size: int = 4096):
+        positions = list(positions)
+        for start in range(0, len(positions), chunk_size):
+            chunk = positions[start:start + chunk_size]
+            gathered = [self.gather(column, chunk) for column in self.column_names]
+            for values in zip(*gathered):
+                yield dict(zip(self.column_names, values))
+
+    def to_records(self) -> list:
+        return list(self.rows(range(self.length)))
+
+    def filter(self, conditions: list, connectors: list) -> list:
+        selection = self._match(*conditions[0], None)
+        for connector, condition in zip(connectors, conditions[1:]):
+            if connector == "and":
+                selection = self._match(*condition, selection)
+            else:
+                selection = sorted(set(selection).union(self._match(*condition, None)))
+        return selection
+
+    def _match(self, column: str, op: str, raw_value: str, selection) -> list:
+        compare = OPERATORS[op]
+        target_str, target_num = typed_target(raw_value, self.types.get(column), op)
+
+        values = self.columns[column]
+        nulls = self.nulls[column]
+        positions = range(self.length) if selection is None else selection
+
+        if type(values) is array:
+            if numpy is not None and type(target_num) is float:
+                return self._match_numpy(values, nulls, compare, op, target_num, selection)
+
+            candidates = values if selection is None else map(values.__getitem__, selection)
+            matched = list(compress(positions, map(compare, candidates, repeat(target_num))))
+            if nulls is None:
+                return matched
+            matched = [pos for pos in matched if not nulls[pos]]
+            if op == '!=':
+                matched = sorted(matched + [pos for pos in positions if nulls[pos]])
+            return matched
+
+        candidates = values if selection is None else [values[pos] for pos in selection]
+        return [
+            pos for pos, value in zip(positions, candidates)
+            if (op in ('==', '!=') or value is not None)
+            and compare(value, target_num if isinstance(value, NUMERIC_TYPES) else target_str)
+        ]
+
+    def _match_numpy(self, values: array, nulls, compare, op: str, target: float, selection) -> list:
+        data = numpy.frombuffer(values, dtype=values.typecode)
+        if selection is not None:
+            index = numpy.asarray(selection, dtype=numpy.int64)
+            data = data[index]
+        mask = compare(data, target)
+
+        if nulls is not None:
+            null_mask = numpy.frombuffer(nulls, dtype=numpy.uint8).astype(bool)
+            if selection is not None:
+                null_mask = null_mask[index]
+            mask = (mask | null_mask) if op == '!=' else (mask & ~null_mask)
+
+        if selection is None:
+            return numpy.flatnonzero(mask).tolist()
+        return index[mask].tolist()
@@ -1,37 +1,76 @@
 import json
 import os
 import shutil
+from contextlib import contextmanager
+from itertools import chain, islice
+
+from aggregate import AGGREGATE_PATTERN, Aggregation, has_aggregate, parse_select_list
+from catalog import CATALOGS, Catalog
+from columnar import ColumnarTable
+from index import HashIndex, SortedIndex
+from join import hash_join, key_function, merge_join
+from locks import TABLE_LOCKS
+from parallel import can_fork, default_workers, estimate_lines, parallel_log_rows, parallel_positions
+from plan import CONVERTERS, LRUCache, TablePlan
+from ordering import index_order, order_rows, paginate, sort_key
+from predicate import BoundCondition, Predicate, compile_condition
+from profiling import NO_PHASE
+from storage import STORAGE_ENGINES
+from table_cache import TableCache
+from transaction import Transaction
+from wal import TMP_SUFFIX, WriteAheadLog, fsync_directory
 
 
 class DBCore:
-    def __init__(self):
+    def __init__(self, cache: TableCache = None):
         self.DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
         self.STRUCTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'structure')
         self.CURRENT_DB  = None
-        self.schemas = {}
         self.DATABASES = []
         self.DB_SYSTEM = "system"
-        self.schemas_system = {}
-        try:
-            schema_list =  os.listdir(os.path.join(self.STRUCTURE_DIR,self.DB_SYSTEM))
-            if schema_list:
-                for filename in schema_list:
-                    table_name = filename.replace("_schema.json", "")
-                    schema_path = os.path.join(self.STRUCTURE_DIR,self.DB_SYSTEM, filename)
-                    
-                    with open(schema_path, 'r', encoding='utf-8') as f:
-                        schema = json.load(f)
-         
-                    self.schemas_system[table_name] = schema
-            
-        except FileNotFoundError:
-            print(f"Avertissement: Le dossier de structures ({self.DB_SYSTEM}) est vide ou manquant. Aucune table chargée.")
-        except json.JSONDecodeError as e:
-            print(f"Erreur: Fichier de schéma JSON invalide : {filename}. Détails : {e}")
-        except Exception as e:
-            print(f"Une erreur inattendue est survenue lors du chargement des schémas : {e}")
+        self.DEFAULT_STORAGE = "log"
+        self.SEQUENCE_CACHE = 1
+        self.sequences = {}
+        self.cache = cache or TableCache()
+        self.STREAM_THRESHOLD = self.cache.max_bytes
+        self.STREAM_CHUNK = 1000
+        self.COLUMNAR = False
+        self.PARALLEL_WORKERS = default_workers()
+        self.PARALLEL_THRESHOLD = 500000
+        self.storages = STORAGE_ENGINES
+        if cache is None:
+            self.storages["log"].listen(self.cache.refresh)
+        self.wals = {}
+        self.transaction = None
+        self.locks = TABLE_LOCKS
+        self.LOCK_TIMEOUT = 10.0
+        self.ASSUME_YES = False
+        self.plans = LRUCache(256)
+        self.profile = None
+
+    def _catalog(self, database_name: str = None) -> Catalog:
+        database_name = database_name or self.CURRENT_DB
+        return CATALOGS.get(
+            os.path.join(self.STRUCTURE_DIR, database_name),
+            os.path.join(self.DATA_DIR, database_name, "catalog.lock"),
+        )
+
+    @property
+    def schemas(self):
+        return self._catalog().schemas if self.CURRENT_DB else {}
+
+    @property
+    def schemas_system(self):
+        return self._catalog(self.DB_SYSTEM).schemas
+
+    @property
+    def index_defs(self) -> dict:
+        return self._catalog().indexes if self.CURRENT_DB else {}
+
+    @property
+    def database_settings(self) -> dict:
+        return self._catalog().settings if self.CURRENT_DB else {}
 
-        
     def load_db(self):
 
         databases = []
@@ -48,30 +87,20 @@ class DBCore:
 
         self.DATABASES = databases
 
+        for database in [self.DB_SYSTEM] + databases:
+            self._recover(database)
 
         if not self.CURRENT_DB:
             print("Aucune base de données sélectionnée. Schémas non chargés.")
             return
-        
-        self.schemas = {}
+
+        self._load_catalog()
+
+    def _load_catalog(self):
         try:
-            schema_list =  os.listdir(os.path.join(self.STRUCTURE_DIR,self.CURRENT_DB))
-            if schema_list:
-                for filename in schema_list:
-                    table_name = filename.replace("_schema.json", "")
-                    schema_path = os.path.join(self.STRUCTURE_DIR,self.CURRENT_DB, filename)
-                    
-                    with open(schema_path, 'r', encoding='utf-8') as f:
-                        schema = json.load(f)
-         
-                    self.schemas[table_name] = schema
-            
-        except FileNotFoundError:
-            print(f"Avertissement: Le dossier de structures ({self.STRUCTURE_DIR}) est vide ou manquant. Aucune table chargée.")
+            self._catalog().refresh()
         except json.JSONDecodeError as e:
-            print(f"Erreur: Fichier de schéma JSON invalide : {filename}. Détails : {e}")
-        except Exception as e:
-            print(f"Une erreur inattendue est survenue lors du chargement des schémas : {e}")
+            print(f"Erreur: Catalogue JSON invalide pour '{self.CURRENT_DB}'. Détails : {e}")
 
     def use_db(self, database_name: str):
         self.CURRENT_DB = database_name
@@ -82,36 +111,136 @@ class DBCore:
         if not os.path.exists(db_data_path) or not os.path.exists(db_struct_path):
             print(f"Database {database_name} introuvable")
         else:
-            self.load_db() 
+            self._recover(database_name)
+            self._load_catalog()
             print(f"Connecté à la base de données '{database_name}'.")
 
+    def _get_wal(self, database_name: str = None) -> WriteAheadLog:
+        directory = os.path.join(self.DATA_DIR, database_name or self.CURRENT_DB)
+        wal = self.wals.get(directory)
+        if wal is None:
+            wal = self.wals[directory] = WriteAheadLog(directory)
+        return wal
+
+    def _recover(self, database_name: str):
+        wal = self._get_wal(database_name)
+        if wal.recovered:
+            return
+        try:
+            replayed = wal.recover()
+        except FileNotFoundError:
+            return
+        if replayed:
+            print(f"Journal de '{database_name}' rejoué : {replayed} fichier(s) restauré(s).")
+
     def _get_schema_path(self, table_name: str) -> str:
         filename = f"{table_name}_schema.json"
         schema_path = os.path.join(self.STRUCTURE_DIR,self.CURRENT_DB, filename)
         return schema_path
 
+    def _save_schema(self, table_name: str, schema: dict):
+        schema_path = self._get_schema_path(table_name)
+        tmp_path = schema_path + TMP_SUFFIX
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(schema, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, schema_path)
+        fsync_directory(os.path.dirname(schema_path))
+
+    def _get_schema(self, table_name: str) -> dict:
+        return self.schemas.get(table_name, {})
+
+    def _get_plan(self, table_name: str) -> TablePlan:
+        schema = self._get_schema(table_name)
+        key = (self.CURRENT_DB, table_name, id(schema))
+        plan = self.plans.get(key)
+        if plan is None or plan.schema is not schema:
+            plan = TablePlan(schema)
+            self.plans.put(key, plan)
+        return plan
+
+    def _compile(self, table_name: str, condition_list: list) -> Predicate:
+        return self._get_plan(table_name).predicate(condition_list)
+
+    def _phase(self, name: str):
+        return NO_PHASE if self.profile is None else self.profile.phase(name)
+
+    def _count(self, counter: str, amount: int):
+        if self.profile is not None:
+            self.profile.counters[counter] += amount
+
+    def _note(self, text: str):
+        if self.profile is not None:
+            self.profile.note(text)
+
+    def _scanned(self, rows):
+        return rows if self.profile is None else self.profile.scanned(rows)
+
+    def _file_size(self, path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _default_storage(self, schema: dict = None) -> str:
+        storage_name = self.database_settings.get("storage", self.DEFAULT_STORAGE)
+        supports = getattr(self.storages.get(storage_name), "supports", None)
+        if schema is not None and supports is not None and not supports(schema):
+            return self.DEFAULT_STORAGE
+        return storage_name
+
+    def _get_storage(self, table_name: str):
+        storage_name = self._get_schema(table_name).get("storage", "json")
+        if storage_name not in self.storages:
+            raise ValueError(f"Moteur de stockage inconnu '{storage_name}' pour la table '{table_name}'.")
+        return self.storages[storage_name]
+
     def _get_data_path(self, table_name):
-        filename = f"{table_name}_data.json"
+        filename = f"{table_name}{self._get_storage(table_name).suffix}"
         schema_path = os.path.join(self.DATA_DIR,self.CURRENT_DB, filename)
         return schema_path
+
+    def _get_index_path(self, index_name: str) -> str:
+        return os.path.join(self.STRUCTURE_DIR, self.CURRENT_DB, f"{index_name}_index.json")
+
+    def _get_columns(self, table_name: str) -> list:
+        return [field['column'] for field in self._get_schema(table_name).get('fields', [])]
+
+    def _get_export_path(self, table_name):
+        filename = f"{table_name}{self.storages['json'].suffix}"
+        return os.path.join(self.DATA_DIR, self.CURRENT_DB, filename)
         
     def _read_data(self, table_name: str) -> list:
         if not self.CURRENT_DB:
             raise Exception("Erreur: Aucune base de données sélectionnée pour lire les données.")
         elif not table_name:
             raise ValueError("Le nom de la table ne peut pas être vide.")
-        elif table_name not in self.schemas:
+        elif not self._get_schema(table_name):
             raise Exception(f"Erreur: La table {table_name} inconnue. Faites 'SHOW TABLES' pour lister les tables")
 
         try:
             data_path = self._get_data_path(table_name)
-            
-            with open(data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            if not isinstance(data, list):
-                raise TypeError("Le fichier de données JSON n'est pas une liste d'enregistrements valide.")
-                
+
+            if self.transaction is not None:
+                changes = self.transaction.changes(data_path)
+                if changes is not None:
+                    self._note(f"{table_name} : lignes de la transaction en cours")
+                    return changes.records
+
+            data = self.cache.get(data_path)
+            if data is not None:
+                self._note(f"{table_name} : lignes en cache")
+                return data
+
+            storage = self._get_storage(table_name)
+            with self._phase("lecture"):
+                data = storage.load(data_path)
+            if self.profile is not None:
+                self._note(f"{table_name} : lecture de {os.path.basename(data_path)} ({storage.name})")
+                self._count("bytes_read", self._file_size(data_path))
+
+            self.cache.put(data_path, data)
             return data
             
         except FileNotFoundError:
@@ -127,18 +256,535 @@ class DBCore:
 
         try:
             data_path = self._get_data_path(table_name)
+
+            if self.transaction is not None:
+                self.transaction.touch(data_path, table_name, self._get_storage(table_name), data).replace(data)
+                self.cache.put(data_path, data)
+                self._note(f"{table_name} : écriture différée jusqu'au COMMIT")
+                return
             
-            with open(data_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-                
+            with self._phase("écriture"):
+                tmp_path = self._get_storage(table_name).prepare(data_path, data)
+                self._count("bytes_written", self._file_size(tmp_path))
+                self._get_wal().commit([(tmp_path, data_path)])
+            self._note(f"{table_name} : réécriture complète de {os.path.basename(data_path)}")
+
+            self.cache.invalidate(data_path)
+            self.cache.put(data_path, data)
             
         except FileNotFoundError:
+            self.cache.invalidate(data_path)
             print(f"Erreur critique: Impossible de trouver ou de créer le chemin pour écrire les données : {data_path}")
             raise
         except Exception as e:
+            self.cache.invalidate(data_path)
+            print(f"Erreur lors de l'écriture des données de la table '{table_name}' : {e}")
+            raise
+
+    def _persist(self, table_name: str, records: list, entries: list):
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée pour écrire les données.")
+
+        data_path = self._get_data_path(table_name)
+        try:
+            if self.transaction is not None:
+                self.transaction.touch(data_path, table_name, self._get_storage(table_name), records).record(records, entries)
+                self._note(f"{table_name} : écriture différée jusqu'au COMMIT")
+            elif self.profile is None:
+                self._get_storage(table_name).append(data_path, records, entries)
+            else:
+                self._profiled_append(table_name, data_path, records, entries)
+            self.cache.put(data_path, records)
+
+        except Exception as e:
+            self.cache.invalidate(data_path)
             print(f"Erreur lors de l'écriture des données de la table '{table_name}' : {e}")
             raise
 
+    def _profiled_append(self, table_name: str, data_path: str, records: list, entries: list):
+        storage = self._get_storage(table_name)
+        before = os.stat(data_path) if os.path.exists(data_path) else None
+        with self._phase("écriture"):
+            storage.append(data_path, records, entries)
+        after = os.stat(data_path)
+        if before is None or before.st_ino != after.st_ino:
+            self._note(f"{table_name} : réécriture complète de {os.path.basename(data_path)}")
+            self._count("bytes_written", after.st_size)
+        else:
+            self._note(f"{table_name} : ajout à {os.path.basename(data_path)} ({storage.name})")
+            self._count("bytes_written", max(after.st_size - before.st_size, 0))
+
+    def _get_lock_path(self, table_name: str, database_name: str = None) -> str:
+        return os.path.join(self.DATA_DIR, database_name or self.CURRENT_DB, f"{table_name}.lock")
+
+    @contextmanager
+    def _lock_tables(self, tables, exclusive: bool = False, database_name: str = None):
+        held = []
+        try:
+            for lock_path in sorted({self._get_lock_path(table_name, database_name) for table_name in tables}):
+                if exclusive and self.transaction is not None:
+                    if lock_path not in self.transaction.locks:
+                        self.locks.get(lock_path).acquire(True, self.LOCK_TIMEOUT)
+                        self.transaction.locks.append(lock_path)
+                    continue
+                lock = self.locks.get(lock_path)
+                lock.acquire(exclusive, self.LOCK_TIMEOUT)
+                held.append(lock)
+            self._catalog(database_name).refresh()
+            yield
+        finally:
+            for lock in reversed(held):
+                lock.release(exclusive)
+
+    def _release_transaction_locks(self, transaction: Transaction):
+        for lock_path in reversed(transaction.locks):
+            self.locks.get(lock_path).release(True)
+        transaction.locks = []
+
+    def begin(self, verbose: bool = True):
+        if self.transaction is not None:
+            print("Une transaction est déjà en cours.")
+            return
+        self.transaction = Transaction()
+        if verbose:
+            print("Transaction démarrée.")
+
+    def commit(self, verbose: bool = True):
+        if self.transaction is None:
+            print("Aucune transaction en cours.")
+            return
+
+        transaction, self.transaction = self.transaction, None
+        system_dir = os.path.join(self.DATA_DIR, self.DB_SYSTEM)
+        try:
+            with self._phase("écriture"):
+                for directory, tables in transaction.by_directory(first=system_dir):
+                    replacements, appends = [], []
+                    for data_path, changes in tables:
+                        if changes.rewrite:
+                            replacements.append((changes.storage.prepare(data_path, changes.records), data_path))
+                        elif changes.entries:
+                            changes.storage.cancel_compaction(data_path)
+                            changes.storage.mark(data_path, changes.entries)
+                            appends.append((data_path, changes.storage.encode(changes.entries)))
+
+                    if self.profile is not None:
+                        self._count("bytes_written", sum(self._file_size(tmp_path) for tmp_path, _ in replacements))
+                        self._count("bytes_written", sum(len(payload.encode('utf-8')) for _, payload in appends))
+                    self._get_wal(os.path.basename(directory)).commit(replacements, appends)
+
+                    for data_path, changes in tables:
+                        if not changes.rewrite and changes.entries:
+                            changes.storage.appended(data_path, changes.records, len(changes.entries))
+                        self.cache.put(data_path, changes.records)
+
+        except Exception as e:
+            for data_path in transaction.tables:
+                self.cache.invalidate(data_path)
+            self.sequences.clear()
+            print(f"Erreur lors de la validation de la transaction : {e}")
+            raise
+        finally:
+            self._release_transaction_locks(transaction)
+
+        self._note(f"COMMIT : {len(transaction.tables)} table(s) écrite(s) via le journal d'écriture anticipée")
+        if verbose:
+            print(f"Transaction validée ({len(transaction.tables)} table(s) écrite(s)).")
+
+    def rollback(self):
+        if self.transaction is None:
+            print("Aucune transaction en cours.")
+            return
+
+        transaction, self.transaction = self.transaction, None
+        for data_path in transaction.tables:
+            self.cache.invalidate(data_path)
+        self.sequences.clear()
+        self._release_transaction_locks(transaction)
+        print("Transaction annulée.")
+
+    def _get_indexes(self, table_name: str, records: list) -> dict:
+        entry = self.cache.entry(self._get_data_path(table_name))
+        if entry is not None and entry.records is records:
+            return entry.indexes
+        return {}
+
+    def _get_primary_key(self, table_name: str):
+        for field in self._get_schema(table_name).get("fields", []):
+            if field.get("primary_key"):
+                return field["column"]
+        return None
+
+    def _get_pk_index(self, table_name: str, records: list) -> HashIndex:
+        pk_column = self._get_primary_key(table_name)
+        indexes = self._get_indexes(table_name, records)
+        index = indexes.get("pkey")
+        if index is None:
+            with self._phase("index"):
+                index = HashIndex(pk_column, self._get_plan(table_name).converters.get(pk_column)).build(records)
+            indexes["pkey"] = index
+        return index
+
+    def _get_sorted_index(self, table_name: str, records: list, index_name: str) -> SortedIndex:
+        indexes = self._get_indexes(table_name, records)
+        index = indexes.get(index_name)
+        if index is None:
+            with self._phase("index"):
+                index = SortedIndex(index_name, self.index_defs[index_name]["column"]).build(records)
+            indexes[index_name] = index
+        return index
+
+    def _index_candidates(self, table_name: str, predicate: Predicate) -> list:
+        if not predicate.conjunctive:
+            return []
+
+        pk_column = self._get_primary_key(table_name)
+        sorted_indexes = {
+            index_def["column"]: name
+            for name, index_def in self.index_defs.items()
+            if index_def["table"] == table_name
+        }
+
+        candidates = []
+        for column, operator, raw_value in predicate.conditions:
+            if column == pk_column and operator == "==":
+                candidates.append(("pkey", column, operator, raw_value))
+            elif column in sorted_indexes:
+                candidates.append((sorted_indexes[column], column, operator, raw_value))
+        return candidates
+
+    def _index_scan(self, table_name: str, predicate: Predicate, records: list):
+        best = None
+        used = None
+        for index_name, column, operator, raw_value in self._index_candidates(table_name, predicate):
+            positions = None
+            if index_name == "pkey":
+                index = self._get_pk_index(table_name, records)
+                if index.unique:
+                    positions = index.lookup(raw_value)
+            else:
+                index = self._get_sorted_index(table_name, records, index_name)
+                positions = index.lookup(operator, raw_value)
+
+            if positions is not None and (best is None or len(positions) < len(best)):
+                best = positions
+                used = f"index '{index_name}' ({column} {operator} {raw_value})"
+
+        if used is not None:
+            self._note(f"{table_name} : {used}, {len(best)} candidat(s)")
+        return best
+
+    def _iter_positions(self, table_name: str, condition_list: list, records: list):
+        if not condition_list:
+            return iter(self._scanned(range(len(records))))
+
+        predicate = self._compile(table_name, condition_list)
+        candidates = self._index_scan(table_name, predicate, records)
+        if candidates is None:
+            self._note(f"{table_name} : parcours complet")
+            return (pos for pos, record in enumerate(self._scanned(records)) if predicate(record))
+        return (pos for pos in self._scanned(candidates) if predicate(records[pos]))
+
+    def _filter_positions(self, table_name: str, condition_list: list, records: list) -> list:
+        with self._phase("filtre"):
+            if condition_list and self.PARALLEL_WORKERS > 1 and len(records) >= self.PARALLEL_THRESHOLD and can_fork():
+                predicate = self._compile(table_name, condition_list)
+                if self._index_scan(table_name, predicate, records) is None:
+                    self._note(f"{table_name} : parcours parallèle ({self.PARALLEL_WORKERS} processus)")
+                    self._count("rows_scanned", len(records))
+                    return parallel_positions(records, condition_list, self._get_schema(table_name), self.PARALLEL_WORKERS)
+            return list(self._iter_positions(table_name, condition_list, records))
+
+    def _index_ordered_records(self, table_name: str, condition_list: list, records: list, order_by: str, descending: bool):
+        index_name = next((
+            name for name, index_def in self.index_defs.items()
+            if index_def["table"] == table_name and index_def["column"] == order_by
+        ), None)
+        if index_name is None:
+            return None
+
+        index = self._get_sorted_index(table_name, records, index_name)
+        column_type = self._get_schema(table_name)["fields"][self._get_columns(table_name).index(order_by)]["type"]
+        if not index.usable or (index.keys and index.numeric != (column_type in ('integer', 'float'))):
+            return None
+
+        nulls = (pos for pos, record in enumerate(records) if record.get(order_by) is None)
+        positions = self._scanned(chain(index_order(index, descending), nulls))
+        self._note(f"{table_name} : tri par l'index '{index_name}'")
+        if condition_list:
+            predicate = self._compile(table_name, condition_list)
+            return (records[pos] for pos in positions if predicate(records[pos]))
+        return (records[pos] for pos in positions)
+
+    def _should_stream(self, table_name: str) -> bool:
+        data_path = self._get_data_path(table_name)
+        if self.cache.entry(data_path) is not None:
+            return False
+        if self.transaction is not None and self.transaction.changes(data_path) is not None:
+            return False
+        try:
+            if os.path.getsize(data_path) <= self.STREAM_THRESHOLD:
+                return False
+        except FileNotFoundError:
+            return False
+        return self._get_storage(table_name).streamable(data_path)
+
+    def _stream_records(self, table_name: str, condition_list: list, limit: int = None):
+        storage = self._get_storage(table_name)
+        data_path = self._get_data_path(table_name)
+        if self.profile is not None:
+            self._note(f"{table_name} : lecture en flux de {os.path.basename(data_path)} ({storage.name})")
+            self._count("bytes_read", self._file_size(data_path))
+        if (condition_list and limit is None and self.PARALLEL_WORKERS > 1 and storage.name == "log" and can_fork()
+                and estimate_lines(data_path) >= self.PARALLEL_THRESHOLD):
+            self._compile(table_name, condition_list)
+            self._note(f"{table_name} : parcours parallèle ({self.PARALLEL_WORKERS} processus)")
+            with self._phase("flux"):
+                return iter(parallel_log_rows(data_path, condition_list, self._get_schema(table_name), self.PARALLEL_WORKERS))
+
+        rows = self._scanned(storage.iter_rows(data_path))
+        if condition_list:
+            predicate = self._compile(table_name, condition_list)
+            rows = (record for record in rows if predicate(record))
+        return rows if self.profile is None else self.profile.timed(rows, "flux")
+
+    def _read_columnar(self, table_name: str):
+        data_path = self._get_data_path(table_name)
+        entry = self.cache.lookup(data_path)
+        if entry is None:
+            records = self._read_data(table_name)
+            entry = self.cache.lookup(data_path)
+            if entry is None:
+                return ColumnarTable.from_records(self._get_schema(table_name), records)
+
+        if entry.columnar is None:
+            columnar = ColumnarTable.from_records(self._get_schema(table_name), entry.records)
+            if columnar is None:
+                return None
+            entry.columnar = columnar
+            entry.records = None
+        return entry.columnar
+
+    def _columnar_positions(self, table_name: str, table: ColumnarTable, condition_list: list):
+        self._note(f"{table_name} : représentation colonnaire")
+        self._count("rows_scanned", len(table))
+        if not condition_list:
+            return range(len(table))
+        predicate = self._compile(table_name, condition_list)
+        with self._phase("filtre"):
+            return table.filter(predicate.conditions, predicate.connectors)
+
+    def _columnar_records(self, table_name: str, condition_list: list):
+        table = self._read_columnar(table_name)
+        if table is None:
+            return None
+        return table.rows(self._columnar_positions(table_name, table, condition_list))
+
+    def set_columnar(self, enabled: bool):
+        self.COLUMNAR = enabled
+        print(f"Mode colonnaire {'activé' if enabled else 'désactivé'}.")
+
+    def _filter_records(self, table_name: str, condition_list: list, records: list) -> list:
+        if not condition_list:
+            self._count("rows_scanned", len(records))
+            return records
+        return [records[pos] for pos in self._filter_positions(table_name, condition_list, records)]
+
+    def create_index(self, index_name: str, table_name: str, column: str):
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée (USE DB).")
+
+        if not index_name or index_name == "pkey":
+            raise ValueError(f"Nom d'index invalide : '{index_name}'.")
+
+        if index_name in self.index_defs:
+            raise ValueError(f"Erreur: L'index '{index_name}' existe déjà dans la base de données '{self.CURRENT_DB}'.")
+
+        if table_name not in self.schemas:
+            raise ValueError(f"Erreur: La table '{table_name}' n'existe pas.")
+
+        if column not in self._get_columns(table_name):
+            raise ValueError(f"Colonne inconnue : {column}")
+
+        with self._lock_tables([table_name], exclusive=False):
+            index_def = {
+                "name": index_name,
+                "table": table_name,
+                "column": column
+            }
+            with open(self._get_index_path(index_name), 'w', encoding='utf-8') as f:
+                json.dump(index_def, f, indent=4, ensure_ascii=False)
+            self._catalog().put_index(index_def)
+
+            records = self._read_data(table_name)
+            self._get_sorted_index(table_name, records, index_name)
+            print(f"Index '{index_name}' créé sur '{table_name}({column})'.")
+
+    def drop_index(self, index_name: str):
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée (USE DB).")
+
+        if index_name not in self.index_defs:
+            raise ValueError(f"Erreur: L'index '{index_name}' n'existe pas dans la base de données '{self.CURRENT_DB}'.")
+
+        index_def = self.index_defs[index_name]
+        self._catalog().drop_index(index_name)
+        entry = self.cache.entry(self._get_data_path(index_def["table"]))
+        if entry is not None:
+            entry.indexes.pop(index_name, None)
+
+        index_path = self._get_index_path(index_name)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        print(f"Index '{index_name}' supprimé.")
+
+    def _append_records(self, table_name: str, records: list, new_records: list):
+        start = len(records)
+        for index in self._get_indexes(table_name, records).values():
+            index.add_all(new_records, start)
+        records.extend(new_records)
+        self._count("rows_written", len(new_records))
+        self._persist(table_name, records, [{"op": "insert", "row": record} for record in new_records])
+
+    def _delete_records(self, table_name: str, records: list, positions: list):
+        drop = set(positions)
+        records[:] = [record for i, record in enumerate(records) if i not in drop]
+        with self._phase("index"):
+            for index in self._get_indexes(table_name, records).values():
+                index.build(records)
+        self._count("rows_written", len(positions))
+        self._persist(table_name, records, [{"op": "delete", "pos": positions}])
+
+    def _update_records(self, table_name: str, records: list, positions: list, changes: dict):
+        for pos in positions:
+            records[pos].update(changes)
+        with self._phase("index"):
+            for index in self._get_indexes(table_name, records).values():
+                if index.column in changes:
+                    index.build(records)
+        self._count("rows_written", len(positions))
+        self._persist(table_name, records, [{"op": "update", "pos": positions, "set": changes}])
+
+    def export_table(self, table_name: str):
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée (USE DB).")
+
+        if table_name not in self.schemas:
+            raise ValueError(f"Erreur: La table '{table_name}' n'existe pas.")
+
+        with self._lock_tables([table_name], exclusive=False):
+            records = self._read_data(table_name)
+            export_path = self._get_export_path(table_name)
+            self.storages["json"].export(export_path, records)
+            print(f"Table '{table_name}' exportée vers '{export_path}'. {len(records)} Enregistrement(s).")
+
+    def import_table(self, table_name: str):
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée (USE DB).")
+
+        if table_name not in self.schemas:
+            raise ValueError(f"Erreur: La table '{table_name}' n'existe pas.")
+
+        with self._lock_tables([table_name], exclusive=True):
+            export_path = self._get_export_path(table_name)
+            records = self.storages["json"].load(export_path)
+
+            schema = self.schemas[table_name]
+            if schema.get("storage", "json") == "json":
+                schema["storage"] = self._default_storage(schema)
+                self._save_schema(table_name, schema)
+                self._catalog().put_table(table_name)
+
+            plan = self._get_plan(table_name)
+            for record in records:
+                plan.convert_record(record)
+
+            self._write_data(table_name, records)
+            print(f"Table '{table_name}' importée depuis '{export_path}' (stockage '{schema['storage']}'). {len(records)} Enregistrement(s).")
+
+    def _check_storage(self, storage_name: str, schema: dict = None):
+        if storage_name not in self.storages:
+            raise ValueError(f"Format de stockage inconnu '{storage_name}'. Formats disponibles : {', '.join(self.storages)}.")
+        supports = getattr(self.storages[storage_name], "supports", None)
+        if schema is not None and supports is not None and not supports(schema):
+            raise ValueError(f"Le format '{storage_name}' n'accepte que des colonnes integer, float ou boolean.")
+
+    def set_storage(self, storage_name: str):
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée (USE DB).")
+        self._check_storage(storage_name)
+
+        self._catalog().set_setting("storage", storage_name)
+        print(f"Format de stockage par défaut de '{self.CURRENT_DB}' : {storage_name}.")
+
+    def convert_table(self, table_name: str, storage_name: str):
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée (USE DB).")
+
+        if table_name not in self.schemas:
+            raise ValueError(f"Erreur: La table '{table_name}' n'existe pas.")
+        self._check_storage(storage_name, self._get_schema(table_name))
+
+        if self.transaction is not None:
+            raise Exception("Erreur: CONVERT TABLE est impossible pendant une transaction.")
+
+        with self._lock_tables([table_name], exclusive=True):
+            schema = self._get_schema(table_name)
+            if schema.get("storage", "json") == storage_name:
+                print(f"La table '{table_name}' est déjà au format '{storage_name}'.")
+                return
+
+            old_storage = self._get_storage(table_name)
+            old_path = self._get_data_path(table_name)
+            old_size = os.path.getsize(old_path) if os.path.exists(old_path) else 0
+            records = self._read_data(table_name)
+
+            storage = self.storages[storage_name]
+            data_path = os.path.join(self.DATA_DIR, self.CURRENT_DB, f"{table_name}{storage.suffix}")
+            self._get_wal().commit([(storage.prepare(data_path, records), data_path)])
+
+            schema["storage"] = storage_name
+            self._save_schema(table_name, schema)
+            self._catalog().put_table(table_name)
+
+            if old_storage.appendable:
+                old_storage.cancel_compaction(old_path)
+            self.cache.invalidate(old_path)
+            if os.path.exists(old_path):
+                os.remove(old_path)
+            if old_storage.appendable:
+                old_storage.forget(old_path)
+            self.cache.put(data_path, records)
+
+            print(f"Table '{table_name}' convertie au format '{storage_name}' : {old_size} -> {os.path.getsize(data_path)} octets.")
+
+    def migrate_table(self, table_name: str) -> int:
+        if not self.CURRENT_DB:
+            raise Exception("Erreur: Aucune base de données sélectionnée (USE DB).")
+
+        if table_name not in self.schemas:
+            raise ValueError(f"Erreur: La table '{table_name}' n'existe pas.")
+
+        with self._lock_tables([table_name], exclusive=True):
+            plan = self._get_plan(table_name)
+            records = []
+            converted = 0
+            for pos, record in enumerate(self._read_data(table_name)):
+                record = dict(record)
+                try:
+                    converted += plan.convert_record(record)
+                except ValueError as e:
+                    raise ValueError(f"Enregistrement {pos + 1} de '{table_name}' : {e}")
+                records.append(record)
+
+            if converted:
+                self._write_data(table_name, records)
+            print(f"Table '{table_name}' migrée : {converted} valeur(s) convertie(s).")
+            return converted
+
+    def migrate_tables(self) -> int:
+        return sum(self.migrate_table(table_name) for table_name in list(self.schemas))
+
     
     def create_database(self, database_name: str):
         if not database_name:
@@ -215,41 +861,14 @@ class DBCore:
           
 
     def _validate_type(self, value, expected_type: str) -> bool:
-        expected_type = expected_type.lower()
-
-        if expected_type == 'string':
-            return value is not None
-        
-        if expected_type == 'integer':
-            if isinstance(value, int):
-                return True
-            if isinstance(value, str):
-                try:
-                    int(value) 
-                    return True
-                except ValueError:
-                    return False
+        converter = CONVERTERS.get(expected_type.lower())
+        if converter is None:
             return False
-
-        if expected_type == 'float':
-            if isinstance(value, (int, float)):
-                return True
-            if isinstance(value, str):
-                try:
-                    float(value)
-                    return True
-                except ValueError:
-                    return False
-            return False
-            
-        if expected_type == 'boolean':
-            if isinstance(value, bool):
-                return True
-            if isinstance(value, str):
-                return value.lower() in ('true', 'false', '1', '0')
+        try:
+            converter(value)
+        except (TypeError, ValueError):
             return False
-
-        return False
+        return True
 
     def create_table(self, table_name: str, fields_def: list):
         if not self.CURRENT_DB:
@@ -265,6 +884,7 @@ class DBCore:
         
         new_schema = {
             "name": table_name,
+            "storage": self._default_storage(),
             "fields": []
         }
         
@@ -346,29 +966,20 @@ class DBCore:
              raise ValueError("Doit définir au moins une colonne pour la table.")
 
         try:
+            new_schema["storage"] = self._default_storage(new_schema)
             schema_path = self._get_schema_path(table_name)
-            data_path = self._get_data_path(table_name)
+            storage = self.storages[new_schema["storage"]]
+            data_path = os.path.join(self.DATA_DIR, self.CURRENT_DB, f"{table_name}{storage.suffix}")
 
             with open(schema_path, 'w', encoding='utf-8') as f:
                 json.dump(new_schema, f, indent=4, ensure_ascii=False)
                 
-            with open(data_path, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=4, ensure_ascii=False)
+            storage.save(data_path, [])
+            self._catalog().put_table(table_name)
                 
             print(f"Table '{table_name}' créée avec succès dans la base de données '{self.CURRENT_DB}'.")
             
-            tmp_schemas = self.schemas
-            tmp_db = self.CURRENT_DB
-
-            self.CURRENT_DB = self.DB_SYSTEM
-            self.schemas = self.schemas_system
-
-            self.insert_data("serials", [f":{table_name}:2"], True)
-
-            self.CURRENT_DB = tmp_db
-            self.schemas = tmp_schemas
-
-            self.load_db()
+            self._create_sequence(table_name)
             
         except Exception as e:
             print(f"Erreur lors de la sauvegarde de la table : {e}")
@@ -430,39 +1041,58 @@ class DBCore:
             print(separator_line)
     
     def get_serial_id(self, table_name: str):
-        data_path = os.path.join(self.DATA_DIR, self.DB_SYSTEM, "serials_data.json")
-        try:
-            with open(data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            if not isinstance(data, list):
-                raise TypeError("Le fichier de données JSON n'est pas une liste d'enregistrements valide.")
+        return self.reserve_serial_ids(table_name, 1)[0]
 
-            
-            new_data = []
-            for i,elem in enumerate(data):
-                if elem["nomtable"] == table_name:
-                    new_id = int(elem["value"])
-                    elem["value"] = str(new_id+1)
-                    index = i
-                    data[i] = elem
-                new_data.append(data[i])
+    def reserve_serial_ids(self, table_name: str, count: int) -> range:
+        sequence = self.sequences.get(table_name)
+        if sequence is None or sequence[0] + count > sequence[1]:
+            sequence = self._allocate_serial_block(table_name, max(count, self.SEQUENCE_CACHE), sequence)
+            self.sequences[table_name] = sequence
 
-            
-        except FileNotFoundError:
-            print("Fichier introuvable.")
-            raise
-            
-        except json.JSONDecodeError:
-            print(f"Erreur: Le fichier de données de la table '{table_name}' est corrompu (JSON invalide).")
-            raise
+        first_id = sequence[0]
+        sequence[0] += count
+        return range(first_id, first_id + count)
 
-        tmp_db = self.CURRENT_DB
+    @contextmanager
+    def _serials(self):
+        tmp_db, transaction = self.CURRENT_DB, self.transaction
         self.CURRENT_DB = self.DB_SYSTEM
-        self._write_data("serials", new_data)
-        self.CURRENT_DB = tmp_db
-        
-        return new_id
+        if transaction is not None and transaction.changes(self._get_data_path("serials")) is None:
+            self.transaction = None
+        try:
+            yield
+        finally:
+            self.CURRENT_DB, self.transaction = tmp_db, transaction
+
+    def _create_sequence(self, table_name: str):
+        with self._serials():
+            self.insert_data("serials", [f":{table_name}:2"], True)
+
+    def _allocate_serial_block(self, table_name: str, size: int, sequence: list) -> list:
+        with self._serials(), self._lock_tables(["serials"], exclusive=True):
+            try:
+                data = self._read_data("serials")
+
+                position = None
+                for i, elem in enumerate(data):
+                    if elem["nomtable"] == table_name:
+                        position = i
+                if position is None:
+                    raise ValueError(f"Erreur: Aucune séquence trouvée pour la table '{table_name}'.")
+
+                high_water = int(data[position]["value"])
+                if sequence is not None and sequence[1] == high_water:
+                    first_id = sequence[0]
+                else:
+                    first_id = high_water
+
+                self._update_records("serials", data, [position], {"value": first_id + size})
+
+            except json.JSONDecodeError:
+                print(f"Erreur: Le fichier de données de la table 'serials' est corrompu (JSON invalide).")
+                raise
+
+        return [first_id, first_id + size]
 
     def insert_data(self, table_name: str, listvalues: list, flag: bool = False):
         if not self.CURRENT_DB:
@@ -471,68 +1101,75 @@ class DBCore:
         if table_name not in self.schemas:
             raise ValueError(f"Erreur: La table '{table_name}' n'existe pas ou n'est pas chargée.")
             
-        schema = self.schemas[table_name]
-        records = self._read_data(table_name)
-
-        counter = 0
-        new_records = []
-        for values in listvalues:
-            new_record = {}
-            counter += 1
-            values = values.split(":")
-            for v in values:
-                v.replace('_', '')
-
-            if len(values) > len(schema['fields']):
-                raise ValueError(f"Erreur: Trop de valeurs fournies. Attendu: {len(schema['fields'])} champs.")
-
-            for i, field in enumerate(schema['fields']):
-                column_name = field['column']
-                expected_type = field['type']
-                default_value = field.get('default')
-                pk_constraint = field.get('primary_key')
+        with self._lock_tables([table_name], exclusive=True):
+            schema = self.schemas[table_name]
+            plan = self._get_plan(table_name)
+            serial_ids = None
+            if any(field.get('auto_increment') for field in schema['fields']):
+                serial_ids = iter(self.reserve_serial_ids(table_name, len(listvalues)))
+
+            records = self._read_data(table_name)
+            pk_index = self._get_pk_index(table_name, records) if self._get_primary_key(table_name) else None
+            new_keys = set()
+
+            counter = 0
+            new_records = []
+            for values in listvalues:
+                new_record = {}
+                counter += 1
+                values = values.split(":")
+                for v in values:
+                    v.replace('_', '')
+
+                if len(values) > len(schema['fields']):
+                    raise ValueError(f"Erreur: Trop de valeurs fournies. Attendu: {len(schema['fields'])} champs.")
+
+                for i, field in enumerate(schema['fields']):
+                    column_name = field['column']
+                    expected_type = field['type']
+                    default_value = field.get('default')
+                    pk_constraint = field.get('primary_key')
                 
-                if pk_constraint:
-                    if field.get('auto_increment'):
-                        new_id = self.get_serial_id(table_name)
-                    else:
-                        if values[i] == "":
-                            raise ValueError("Le clé primaire ne peut pas être null")
-                        if not self._validate_type(values[i], expected_type):
-                            raise ValueError(f"Le type de la clé primaire doit être {expected_type}")
-                        new_id = values[i]
-                    for record in records:
-                        if record[column_name] == new_id:
+                    if pk_constraint:
+                        if field.get('auto_increment'):
+                            new_id = next(serial_ids)
+                        else:
+                            if values[i] == "":
+                                raise ValueError("Le clé primaire ne peut pas être null")
+                            try:
+                                new_id = plan.convert(column_name, values[i])
+                            except ValueError:
+                                raise ValueError(f"Le type de la clé primaire doit être {expected_type}")
+                        if new_id in pk_index or new_id in new_keys:
                             raise ValueError(f"Erreur de contrainte: La valeur '{new_id}' est déjà utilisée pour la clé primaire.")
-                    new_record[column_name] = new_id
+                        new_keys.add(new_id)
+                        new_record[column_name] = new_id
 
-                else:
-
-                    if values[i] != "":
-                        value = values[i].replace('_',' ')
-                        if not self._validate_type(value, expected_type):
-                            determined_type = type(value).__name__
-                            raise TypeError(
-                                f"Erreur de type pour la colonne '{column_name}'. Valeur '{value}' (Type: {determined_type}) "
-                                f"n'est pas valide pour le type attendu: '{expected_type}'."
-                            )
-
-                        new_record[column_name] = value
                     else:
-                        if default_value:
-                            value = default_value
+
+                        if values[i] != "":
+                            value = values[i].replace('_',' ')
+                            try:
+                                new_record[column_name] = plan.convert(column_name, value)
+                            except ValueError:
+                                determined_type = type(value).__name__
+                                raise TypeError(
+                                    f"Erreur de type pour la colonne '{column_name}'. Valeur '{value}' (Type: {determined_type}) "
+                                    f"n'est pas valide pour le type attendu: '{expected_type}'."
+                                )
                         else:
-                            value = None
-                        new_record[column_name] = value
+                            if default_value:
+                                value = plan.convert(column_name, default_value)
+                            else:
+                                value = None
+                            new_record[column_name] = value
 
             
-            new_records.append(new_record)
-        records = self._read_data(table_name)
-        records.extend(new_records)
-        self._write_data(table_name, records)
+                new_records.append(new_record)
+            self._append_records(table_name, records, new_records)
         
-        if not flag:
-            print(f"Insertion réussie dans '{table_name}'. {counter} Enregistrement ajouté.")
+            if not flag:
+                print(f"Insertion réussie dans '{table_name}'. {counter} Enregistrement ajouté.")
         
 
     def drop_table(self, table_name: str):
@@ -543,32 +1180,45 @@ class DBCore:
             raise ValueError(f"Erreur: La table '{table_name}' n'existe pas dans la base de données '{self.CURRENT_DB}'.")
 
         print(f"AVERTISSEMENT: Toutes les données de la table '{table_name}' seront DÉFINITIVEMENT supprimées.")
-        confirmation = input("Êtes-vous sûr de vouloir supprimer cette table et ses enregistrements ? (oui/non) : ").lower()
+        confirmation = "oui" if self.ASSUME_YES else input("Êtes-vous sûr de vouloir supprimer cette table et ses enregistrements ? (oui/non) : ").lower()
 
         if confirmation != 'oui':
             print("Opération annulée par l'utilisateur.")
             return
 
-        schema_path = self._get_schema_path(table_name)
-        data_path = self._get_data_path(table_name)
+        with self._lock_tables([table_name], exclusive=True):
+            schema_path = self._get_schema_path(table_name)
+            storage = self._get_storage(table_name)
+            data_path = self._get_data_path(table_name)
+            data_paths = {data_path, self._get_export_path(table_name)}
 
-        try:
-            if os.path.exists(data_path):
-                os.remove(data_path)
-            
-            if os.path.exists(schema_path):
-                os.remove(schema_path)
+            try:
+                index_names = [name for name, index_def in self.index_defs.items() if index_def["table"] == table_name]
+                if os.path.exists(schema_path):
+                    os.remove(schema_path)
+                self._catalog().drop_table(table_name)
 
-            """Mettre les actions pour les 
-            metadonnées plust tard"""
+                for path in data_paths:
+                    self.cache.invalidate(path)
+                    if self.transaction is not None:
+                        self.transaction.discard(path)
+                    if os.path.exists(path):
+                        os.remove(path)
+                if storage.appendable:
+                    storage.forget(data_path)
 
-            self.load_db()
+                for index_name in index_names:
+                    index_path = self._get_index_path(index_name)
+                    if os.path.exists(index_path):
+                        os.remove(index_path)
 
-            print(f"Table '{table_name}' supprimée avec succès.")
+                self.sequences.pop(table_name, None)
 
-        except Exception as e:
-            print(f"Erreur lors de la suppression de la table '{table_name}': {e}")
-            raise
+                print(f"Table '{table_name}' supprimée avec succès.")
+
+            except Exception as e:
+                print(f"Erreur lors de la suppression de la table '{table_name}': {e}")
+                raise
 
 
     def drop_database(self, database_name: str):
@@ -580,7 +1230,7 @@ class DBCore:
                 
         if schema_list:
             print(f"AVERTISSEMENT: Toutes les données de la base '{database_name}' seront DÉFINITIVEMENT supprimées.")
-            confirmation = input("Êtes-vous sûr de vouloir supprimer cette base et ses enregistrements ? (oui/non) : ").lower()
+            confirmation = "oui" if self.ASSUME_YES else input("Êtes-vous sûr de vouloir supprimer cette base et ses enregistrements ? (oui/non) : ").lower()
 
             if confirmation != 'oui':
                 print("Opération annulée par l'utilisateur.")
@@ -614,81 +1264,135 @@ class DBCore:
 
 
     
-    def display_result(self, colname: list , resultat: list):
+    def _display(self, colname: list, resultat, chunk_size: int = None) -> int:
+        if self.profile is None:
+            return self.display_result(colname, resultat, chunk_size)
+        with self._phase("affichage"):
+            count = self.display_result(colname, resultat, chunk_size)
+        self._count("rows_returned", count)
+        return count
+
+    def display_result(self, colname: list , resultat, chunk_size: int = None) -> int:
+        rows = iter(resultat)
         col_widths = {name: len(name) for name in colname}
+        separator = None
+        count = 0
 
-        for record in resultat:
-            for name in colname:
-                value = record.get(name)
-                display_value = 'NULL' if value is None else str(value)
-                col_widths[name] = max(col_widths[name], len(display_value))
+        while True:
+            chunk = list(islice(rows, chunk_size)) if chunk_size else list(rows)
+            if not chunk and separator is not None:
+                break
 
-        total_width = sum(col_widths.values()) + (len(colname) * 3) + 1
-        separator = "=" * total_width
+            widths = dict(col_widths)
+            for record in chunk:
+                for name in colname:
+                    value = record.get(name)
+                    display_value = 'NULL' if value is None else str(value)
+                    widths[name] = max(widths[name], len(display_value))
+
+            if separator is None or widths != col_widths:
+                if separator is not None:
+                    print(separator)
+                col_widths = widths
+                total_width = sum(col_widths.values()) + (len(colname) * 3) + 1
+                separator = "=" * total_width
+
+                print(separator)
+
+                header_row = "|"
+                for name in colname:
+                    width = col_widths[name]
+                    header_row += f" {name.center(width)} |"
+                print(header_row)
+                
+                print(separator)
+
+            for record in chunk:
+                data_row = "|"
+                for name in colname:
+                    width = col_widths[name]
+                    value = record.get(name)
+                    display_value = 'NULL' if value is None else str(value)
+                    
+                    data_row += f" {display_value.ljust(width)} |"
+                data_row = data_row.replace('\n', ' ')
+                print(data_row)
 
-        print(separator)
+            count += len(chunk)
+            if not chunk_size:
+                break
 
-        header_row = "|"
-        for name in colname:
-            width = col_widths[name]
-            header_row += f" {name.center(width)} |"
-        print(header_row)
-        
         print(separator)
+        return count
 
-        for record in resultat:
-            data_row = "|"
-            for name in colname:
-                width = col_widths[name]
-                value = record.get(name)
-                display_value = 'NULL' if value is None else str(value)
-                
-                data_row += f" {display_value.ljust(width)} |"
-            data_row = data_row.replace('\n', ' ')
-            print(data_row)
+    def _aggregate(self, table_name: str, condition_list: list, items: list, group_by: str) -> list:
+        aggregation = Aggregation(items, group_by, self._get_schema(table_name))
 
-        print(separator)
-    
-    def _evaluate_condition(self, record: dict, parts: list) -> bool:
+        if self._should_stream(table_name):
+            aggregation.feed(self._stream_records(table_name, condition_list))
+            return aggregation.results()
 
-        if len(parts) != 3:
-            raise ValueError(f"Format de condition invalide: '{' '.join(parts)}'. Format attendu: 'colonne opérateur valeur'.")
+        if self.COLUMNAR:
+            table = self._read_columnar(table_name)
+            if table is not None:
+                positions = self._columnar_positions(table_name, table, condition_list)
+                aggregation.feed_columns(table.gather, list(positions))
+                return aggregation.results()
 
-        col_name, operator, raw_target_value = parts
-        
-        record_value = record.get(col_name)
+        all_records = self._read_data(table_name)
+        aggregation.feed(self._filter_records(table_name, condition_list, all_records))
+        return aggregation.results()
 
-        target_str = raw_target_value.strip("'").strip('"')
-        
-        try:
-            if isinstance(record_value, (int, float)):
-                target_value = float(target_str)
-            elif isinstance(record_value, bool):
-                target_value = target_str.lower() in ('true', '1')
-            else:
-                target_value = target_str
-                
-        except ValueError:
-            target_value = target_str 
-            
-        if operator == '==':
-            return record_value == target_value
-        elif operator == '!=':
-            return record_value != target_value
-        elif operator == '>':
-            return record_value is not None and record_value > target_value
-        elif operator == '<':
-            return record_value is not None and record_value < target_value
-        elif operator == '>=':
-            return record_value is not None and record_value >= target_value
-        elif operator == '<=':
-            return record_value is not None and record_value <= target_value
+    def _select_items(self, columns: str, column_names: list, group_by: str):
+        if columns != "*":
+            items = parse_select_list(columns, column_names)
+            return items, [item.label for item in items]
+        if group_by:
+            raise ValueError("SELECT * est incompatible avec GROUP BY.")
+        return None, None
+
+    def _display_aggregates(self, label: str, result: list, columns_list: list, order_by: str, descending: bool,
+                            limit: int, offset: int):
+        if order_by and order_by not in columns_list:
+            raise KeyError(f"Colonne inconnue dans ORDER BY : {order_by}")
+
+        if order_by:
+            with self._phase("tri"):
+                result = order_rows(result, sort_key(order_by, descending=descending), descending, limit, offset)
         else:
-            raise ValueError(f"Opérateur non supporté: {operator}")
-    
+            result = list(paginate(result, limit, offset))
+
+        if not result:
+            print(f"Aucun enregistrement trouvé pour la table '{label}' correspondant à la condition.")
+            return
+        self._display(columns_list, result)
 
+    def _display_rows(self, label: str, schema: dict, result, columns_list: list, order_by: str, descending: bool,
+                      limit: int, offset: int, ordered: bool = False, chunk_size: int = None):
+        column_names = [field['column'] for field in schema['fields']]
+        if self.profile is not None:
+            result = self.profile.timed(result, "filtre")
+        if order_by and not ordered:
+            column_type = schema['fields'][column_names.index(order_by)]['type']
+            key = sort_key(order_by, column_type, descending)
+            with self._phase("tri"):
+                result = iter(order_rows(result, key, descending, limit, offset))
+        elif limit is not None or offset:
+            result = paginate(result, limit, offset)
+
+        first = next(result, None)
+        if first is None:
+            print(f"Aucun enregistrement trouvé pour la table '{label}' correspondant à la condition.")
+            return
+        result = chain([first], result)
+
+        if columns_list:
+            result = ({column: res[column] for column in columns_list} for res in result)
+            column_names = columns_list
+        self._display(column_names, result, chunk_size)
 
-    def select_data(self, table_name: str, condition_list: str = None, columns: str = "*"):
+    def explain(self, table_name: str, condition_list: list = None, order_by: str = None, limit: int = None,
+                write: str = None):
         if not self.CURRENT_DB:
             print("Erreur: Aucune base de données sélectionnée.")
             return
@@ -696,94 +1400,266 @@ class DBCore:
         if table_name not in self.schemas:
             print(f"Erreur: La table '{table_name}' n'existe pas.")
             return
-        all_records = self._read_data(table_name)
-        if condition_list:
 
-            if len(condition_list) % 2 == 0:
-                raise SyntaxError(f"Les conditions sont manquant. voir 'HELP'")
-
-            conds_list = condition_list[::2]
-            logical_operands = condition_list[1::2]
-
-            starting_records = all_records
-            result = []
-            for i,cond in enumerate(conds_list):
-                if i != 0:
-                    if logical_operands[i-1].lower() == "or":
-                        starting_records = all_records
-                    elif logical_operands[i-1].lower() == "and":
-                        starting_records = result
-                    if cond:
-                        keys = starting_records[0].keys()
-                        parts = cond.split(":")
-                        if len(parts) != 3:
-                            raise SyntaxError(f"Synthaxe de condition incorrect: <column>:<operateur>:<value>")
-                        if parts[0] not in keys:
-                            raise ValueError(f"Colonne inconnu: {parts[0]}.")
-                        try:
-                            filtered_records = [
-                                record for record in starting_records 
-                                if self._evaluate_condition(record, parts)
-                            ]
-                        except ValueError as e:
-                            print(f"Erreur de syntaxe de la condition WHERE : {e}")
-                            return
-                    else:
-                        filtered_records = starting_records
-                    if logical_operands[i-1].lower() == "or":
-                        result.extend(filtered_records)
-                    elif logical_operands[i-1].lower() == "and":
-                        result = filtered_records
-                else:
-                    if cond:
-                        keys = starting_records[0].keys()
-                        parts = cond.split(":")
-                        if len(parts) != 3:
-                            raise SyntaxError(f"Synthaxe de condition incorrect: <column>:<operateur>:<value>")
-                        if parts[0] not in keys:
-                            raise ValueError(f"Colonne inconnu: {parts[0]}.")
-                        try:
-                            result = [
-                                record for record in starting_records 
-                                if self._evaluate_condition(record, parts)
-                            ]
-                        except ValueError as e:
-                            print(f"Erreur de syntaxe de la condition WHERE : {e}")
-                            return
-                    else:
-                        result = starting_records
+        storage = self._get_storage(table_name)
+        data_path = self._get_data_path(table_name)
+        lines = [
+            f"Plan pour '{table_name}' :",
+            f"  Stockage : {storage.name}, {os.path.basename(data_path)} ({self._file_size(data_path)} octets)",
+        ]
+
+        entry = self.cache.lookup(data_path)
+        if self.transaction is not None and self.transaction.changes(data_path) is not None:
+            lines.append("  Lecture : lignes de la transaction en cours")
+        elif entry is not None:
+            count = len(entry.records) if entry.records is not None else len(entry.columnar)
+            lines.append(f"  Lecture : en cache ({count} lignes)")
+        elif write is None and self._should_stream(table_name):
+            lines.append(f"  Lecture : en flux par blocs de {self.STREAM_CHUNK} lignes")
         else:
-            result = all_records
+            lines.append("  Lecture : chargement complet du fichier")
+        if write is None and self.COLUMNAR:
+            lines.append("  Représentation : colonnaire")
+
+        if write != "insert":
+            candidates = []
+            if condition_list:
+                predicate = self._compile(table_name, condition_list)
+                candidates = self._index_candidates(table_name, predicate)
+                lines.append(f"  Filtre : {' '.join(condition_list)}")
+            if candidates:
+                choices = ", ".join(f"'{name}' ({column} {operator} {raw_value})" for name, column, operator, raw_value in candidates)
+                lines.append(f"  Accès : index le plus sélectif parmi {choices}")
+            elif condition_list and self.PARALLEL_WORKERS > 1 and can_fork():
+                lines.append(f"  Accès : parcours complet, parallèle ({self.PARALLEL_WORKERS} processus) "
+                             f"à partir de {self.PARALLEL_THRESHOLD} lignes")
+            else:
+                lines.append("  Accès : parcours complet")
+
+        if order_by:
+            index_name = next((
+                name for name, index_def in self.index_defs.items()
+                if index_def["table"] == table_name and index_def["column"] == order_by
+            ), None)
+            if index_name is not None and (limit is not None or not condition_list):
+                lines.append(f"  Tri : index '{index_name}'")
+            else:
+                lines.append(f"  Tri : en mémoire sur '{order_by}'")
+
+        if write is not None:
+            if self.transaction is not None:
+                mode = "différée jusqu'au COMMIT"
+            elif write == "delete" and not condition_list:
+                mode = "réécriture complète du fichier"
+            elif storage.appendable:
+                mode = "ajout d'entrées au journal"
+            elif storage.name == "fixed" and write != "delete":
+                mode = "lignes de taille fixe écrites en place"
+            else:
+                mode = "réécriture complète du fichier"
+            lines.append(f"  Écriture : {mode}")
 
-                
+        for line in lines:
+            print(line)
 
-        if not result:
-            print(f"Aucun enregistrement trouvé pour la table '{table_name}' correspondant à la condition.")
+    def select_data(self, table_name: str, condition_list: str = None, columns: str = "*", group_by: str = None,
+                    order_by: str = None, descending: bool = False, limit: int = None, offset: int = 0):
+        if not self.CURRENT_DB:
+            print("Erreur: Aucune base de données sélectionnée.")
             return
 
+        if table_name not in self.schemas:
+            print(f"Erreur: La table '{table_name}' n'existe pas.")
+            return
         schema = self.schemas[table_name]
         column_names = [field['column'] for field in schema['fields']]
 
-        
-        if columns != "*":
-            filter = []
-            columns_list = columns.split(",")
-            for column in columns_list:
-                if column not in column_names:
-                    raise KeyError(f"Colonne inconnue : {column}")
-            for res in result:
-                record = {}
-                for column in columns_list:
-                    record[column] = res[column]
-                filter.append(record)
-            result = filter
-            column_names = columns_list
-        self.display_result(column_names, result)
-        
+        items, columns_list = self._select_items(columns, column_names, group_by)
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("LIMIT et OFFSET doivent être positifs.")
 
+        with self._lock_tables([table_name], exclusive=False):
+            if group_by or (items and has_aggregate(items)):
+                with self._phase("agrégation"):
+                    result = self._aggregate(table_name, condition_list, items, group_by)
+                self._display_aggregates(table_name, result, columns_list, order_by, descending, limit, offset)
+                return
 
+            if order_by and order_by not in column_names:
+                raise KeyError(f"Colonne inconnue dans ORDER BY : {order_by}")
+
+            streaming = self._should_stream(table_name)
+            result = None
+            ordered = False
+            if streaming:
+                result = self._stream_records(table_name, condition_list, limit)
+            elif self.COLUMNAR:
+                result = self._columnar_records(table_name, condition_list)
+            if result is None:
+                all_records = self._read_data(table_name)
+                if order_by and (limit is not None or not condition_list):
+                    result = self._index_ordered_records(table_name, condition_list, all_records, order_by, descending)
+                    ordered = result is not None
+                if result is None:
+                    if limit is None:
+                        positions = self._filter_positions(table_name, condition_list, all_records)
+                    else:
+                        positions = self._iter_positions(table_name, condition_list, all_records)
+                    result = (all_records[pos] for pos in positions)
+
+            self._display_rows(table_name, schema, result, columns_list, order_by, descending, limit, offset,
+                               ordered, self.STREAM_CHUNK if streaming else None)
+
+    def _qualify(self, name: str, tables: tuple) -> str:
+        if "." in name:
+            table_name, column = name.split(".", 1)
+            if table_name not in tables or column not in self._get_columns(table_name):
+                raise KeyError(f"Colonne inconnue : {name}")
+            return name
+
+        owners = [table_name for table_name in tables if name in self._get_columns(table_name)]
+        if not owners:
+            raise KeyError(f"Colonne inconnue : {name}")
+        if len(owners) > 1:
+            raise ValueError(f"Colonne ambiguë : {name}. Préfixez-la par le nom de la table.")
+        return f"{owners[0]}.{name}"
+
+    def _qualify_columns(self, columns: str, tables: tuple) -> str:
+        if columns == "*":
+            return columns
+
+        qualified = []
+        for token in columns.split(","):
+            match = AGGREGATE_PATTERN.match(token)
+            if match is None:
+                qualified.append(self._qualify(token, tables))
+            elif match.group(2) == "*":
+                qualified.append(token)
+            else:
+                qualified.append(f"{match.group(1)}({self._qualify(match.group(2), tables)})")
+        return ",".join(qualified)
+
+    def _qualify_conditions(self, condition_list: list, tables: tuple) -> list:
+        qualified = []
+        for i, cond in enumerate(condition_list or []):
+            if i % 2 == 1 or ":" not in cond:
+                qualified.append(cond)
+                continue
+            if isinstance(cond, BoundCondition):
+                column, op, value = cond.parts
+                qualified.append(BoundCondition(self._qualify(column, tables), op, value))
+                continue
+            column, rest = cond.split(":", 1)
+            qualified.append(f"{self._qualify(column, tables)}:{rest}")
+        return qualified
+
+    def _join_index(self, table_name: str, column: str, column_type: str, records: list):
+        for name, index_def in self.index_defs.items():
+            if index_def["table"] == table_name and index_def["column"] == column:
+                index = self._get_sorted_index(table_name, records, name)
+                if index.usable and (not index.keys or index.numeric == (column_type in ('integer', 'float'))):
+                    return index
+        return None
+
+    def select_join(self, left: str, right: str, on: str, condition_list: list = None, columns: str = "*",
+                    group_by: str = None, order_by: str = None, descending: bool = False, limit: int = None, offset: int = 0):
+        if not self.CURRENT_DB:
+            print("Erreur: Aucune base de données sélectionnée.")
+            return
+
+        for table_name in (left, right):
+            if table_name not in self.schemas:
+                print(f"Erreur: La table '{table_name}' n'existe pas.")
+                return
+        if left == right:
+            raise ValueError("La jointure d'une table avec elle-même n'est pas supportée.")
+
+        tables = (left, right)
+        sides = on.replace("==", "=").split("=")
+        if len(sides) != 2:
+            raise SyntaxError("Synthaxe de jointure incorrecte : ON <table>.<colonne>=<table>.<colonne>")
+        keys = dict(self._qualify(side, tables).split(".", 1) for side in sides)
+        if len(keys) != 2:
+            raise SyntaxError("La condition ON doit relier une colonne de chaque table.")
+
+        joined_schema = {"name": f"{left}_{right}", "fields": [
+            dict(field, column=f"{table_name}.{field['column']}")
+            for table_name in tables for field in self.schemas[table_name]['fields']
+        ]}
+        column_names = [field['column'] for field in joined_schema['fields']]
+
+        columns = self._qualify_columns(columns, tables)
+        condition_list = self._qualify_conditions(condition_list, tables)
+        group_by = self._qualify(group_by, tables) if group_by else None
+        items, columns_list = self._select_items(columns, column_names, group_by)
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("LIMIT et OFFSET doivent être positifs.")
+
+        local_conditions = {table_name: [] for table_name in tables}
+        predicate = None
+        if condition_list:
+            predicate = compile_condition(condition_list, joined_schema)
+            if predicate.conjunctive:
+                for column, op, raw_value in predicate.conditions:
+                    table_name, local_column = column.split(".", 1)
+                    if local_conditions[table_name]:
+                        local_conditions[table_name].append("and")
+                    local_conditions[table_name].append(BoundCondition(local_column, op, raw_value))
+                predicate = None
+
+        with self._lock_tables(tables, exclusive=False):
+            records, positions, types = {}, {}, {}
+            for table_name in tables:
+                records[table_name] = self._read_data(table_name)
+                positions[table_name] = self._filter_positions(table_name, local_conditions[table_name], records[table_name])
+                types[table_name] = self._get_schema(table_name)['fields'][self._get_columns(table_name).index(keys[table_name])]['type']
+
+            indexes = [self._join_index(t, keys[t], types[t], records[t]) for t in tables]
+            if all(indexes) and indexes[0].numeric == indexes[1].numeric:
+                def walk(index, table_name):
+                    allowed = set(positions[table_name]) if local_conditions[table_name] else None
+                    return ((key, pos) for key, pos in zip(index.keys, index.positions) if allowed is None or pos in allowed)
+                pairs = merge_join(walk(indexes[0], left), walk(indexes[1], right))
+                self._note(f"{left} JOIN {right} : fusion sur les index triés")
+            else:
+                key = key_function(types[left], types[right])
+                def keyed(table_name):
+                    table_records, column = records[table_name], keys[table_name]
+                    return ((pos, key(table_records[pos].get(column))) for pos in positions[table_name])
+
+                if len(positions[left]) <= len(positions[right]):
+                    pairs = hash_join(keyed(left), keyed(right))
+                    self._note(f"{left} JOIN {right} : jointure par hachage sur '{left}'")
+                else:
+                    pairs = ((left_pos, right_pos) for right_pos, left_pos in hash_join(keyed(right), keyed(left)))
+                    self._note(f"{left} JOIN {right} : jointure par hachage sur '{right}'")
+
+            left_columns = [(f"{left}.{column}", column) for column in self._get_columns(left)]
+            right_columns = [(f"{right}.{column}", column) for column in self._get_columns(right)]
+            def combine(left_pos, right_pos):
+                left_record, right_record = records[left][left_pos], records[right][right_pos]
+                row = {name: left_record.get(column) for name, column in left_columns}
+                row.update((name, right_record.get(column)) for name, column in right_columns)
+                return row
+
+            result = (combine(left_pos, right_pos) for left_pos, right_pos in pairs)
+            if predicate is not None:
+                result = (row for row in result if predicate(row))
+            if self.profile is not None:
+                result = self.profile.timed(result, "jointure")
+
+            label = f"{left} JOIN {right}"
+            if group_by or (items and has_aggregate(items)):
+                aggregation = Aggregation(items, group_by, joined_schema)
+                aggregation.feed(result)
+                order_by = order_by if not order_by or order_by in columns_list else self._qualify(order_by, tables)
+                self._display_aggregates(label, aggregation.results(), columns_list, order_by, descending, limit, offset)
+                return
+
+            order_by = self._qualify(order_by, tables) if order_by else None
+            self._display_rows(label, joined_schema, result, columns_list, order_by, descending, limit, offset,
+                               chunk_size=self.STREAM_CHUNK)
 
-        
     def delete_data(self, table_name, condition_list):
         if not self.CURRENT_DB:
             print("Erreur: Aucune base de données sélectionnée.")
@@ -793,69 +1669,13 @@ class DBCore:
             print(f"Erreur: La table '{table_name}' n'existe pas.")
             return
         
-        all_records = self._read_data(table_name)
-        if condition_list:
-
-            if len(condition_list) % 2 == 0:
-                raise SyntaxError(f"Les conditions sont manquant. voir 'HELP'")
-
-            conds_list = condition_list[::2]
-            logical_operands = condition_list[1::2]
-
-            starting_records = all_records
-            result = []
-            for i,cond in enumerate(conds_list):
-                if i != 0:
-                    if logical_operands[i-1].lower() == "or":
-                        starting_records = all_records
-                    elif logical_operands[i-1].lower() == "and":
-                        starting_records = result
-                    if cond:
-                        keys = starting_records[0].keys()
-                        parts = cond.split(":")
-                        if len(parts) != 3:
-                            raise SyntaxError(f"Synthaxe de condition incorrect: <column>:<operateur>:<value>")
-                        if parts[0] not in keys:
-                            raise ValueError(f"Colonne inconnu: {parts[0]}.")
-                        try:
-                            filtered_records = [
-                                record for record in starting_records 
-                                if self._evaluate_condition(record, parts)
-                            ]
-                        except ValueError as e:
-                            print(f"Erreur de syntaxe de la condition WHERE : {e}")
-                            return
-                    else:
-                        filtered_records = starting_records
-                    if logical_operands[i-1].lower() == "or":
-                        result.extend(filtered_records)
-                    elif logical_operands[i-1].lower() == "and":
-                        result = filtered_records
-                else:
-                    if cond:
-                        keys = starting_records[0].keys()
-                        parts = cond.split(":")
-                        if len(parts) != 3:
-                            raise SyntaxError(f"Synthaxe de condition incorrect: <column>:<operateur>:<value>")
-                        if parts[0] not in keys:
-                            raise ValueError(f"Colonne inconnu: {parts[0]}.")
-                        try:
-                            result = [
-                                record for record in starting_records 
-                                if self._evaluate_condition(record, parts)
-                            ]
-                        except ValueError as e:
-                            print(f"Erreur de syntaxe de la condition WHERE : {e}")
-                            return
-                    else:
-                        result = starting_records
-            new_data = []
-            for record in all_records:
-                if record not in result:
-                    new_data.append(record)
-            self._write_data(table_name, new_data)
-        else:
-            self._write_data(table_name, [])
+        with self._lock_tables([table_name], exclusive=True):
+            all_records = self._read_data(table_name)
+            if condition_list:
+                positions = self._filter_positions(table_name, condition_list, all_records)
+                self._delete_records(table_name, all_records, positions)
+            else:
+                self._write_data(table_name, [])
 
 
     def update_data(self, table_name: str, new_value: str, condition_list: list):
@@ -887,77 +1707,19 @@ class DBCore:
                    print("Le clé primaire ne peut pas etre chagé.")
                    return
 
-                if not self._validate_type(value, col_type):
+                try:
+                    value = self._get_plan(table_name).convert(col, value)
+                except ValueError:
                     print(f"La colonne {col} doit être de type {col_type}.")
                     return
                 
-                all_records = self._read_data(table_name)
-                if condition_list:
-
-                    if len(condition_list) % 2 == 0:
-                        raise SyntaxError(f"Les conditions sont manquant. voir 'HELP'")
-
-                    conds_list = condition_list[::2]
-                    logical_operands = condition_list[1::2]
-
-                    starting_records = all_records
-                    result = []
-                    for i,cond in enumerate(conds_list):
-                        if i != 0:
-                            if logical_operands[i-1].lower() == "or":
-                                starting_records = all_records
-                            elif logical_operands[i-1].lower() == "and":
-                                starting_records = result
-                            if cond:
-                                keys = starting_records[0].keys()
-                                parts = cond.split(":")
-                                if len(parts) != 3:
-                                    raise SyntaxError(f"Synthaxe de condition incorrect: <column>:<operateur>:<value>")
-                                
-                                if parts[0] not in keys:
-                                    raise ValueError(f"Colonne inconnu: {parts[0]}.")
-                                try:
-                                    filtered_records = [
-                                        record for record in starting_records 
-                                        if self._evaluate_condition(record, parts)
-                                    ]
-                                except ValueError as e:
-                                    print(f"Erreur de syntaxe de la condition WHERE : {e}")
-                                    return
-                            else:
-                                filtered_records = starting_records
-                            if logical_operands[i-1].lower() == "or":
-                                result.extend(filtered_records)
-                            elif logical_operands[i-1].lower() == "and":
-                                result = filtered_records
-                        else:
-                            if cond:
-                                keys = starting_records[0].keys()
-                                parts = cond.split(":")
-                                if len(parts) != 3:
-                                    raise SyntaxError(f"Synthaxe de condition incorrect: <column>:<operateur>:<value>")
-                                if parts[0] not in keys:
-                                    raise ValueError(f"Colonne inconnu: {parts[0]}.")
-                                try:
-                                    result = [
-                                        record for record in starting_records 
-                                        if self._evaluate_condition(record, parts)
-                                    ]
-                                except ValueError as e:
-                                    print(f"Erreur de syntaxe de la condition WHERE : {e}")
-                                    return
-                            else:
-                                result = starting_records
-                else:
-                    result = all_records
-                
-                for record in all_records:
-                    if record in result:
-                        record[col] = value
-                self._write_data(table_name, all_records)
+                with self._lock_tables([table_name], exclusive=True):
+                    all_records = self._read_data(table_name)
+                    positions = self._filter_positions(table_name, condition_list, all_records)
+                    self._update_records(table_name, all_records, positions, {col: value})
                 return
                            
-        raise("Colonne {col} inconnu.")
+        raise ValueError(f"Colonne {col} inconnu.")
     
 
     def add_column(self, table_name: str, fields_def:list):
@@ -1055,16 +1817,7 @@ class DBCore:
 
 
         if flag:
-            tmp_schemas = self.schemas
-            tmp_db = self.CURRENT_DB
-
-            self.CURRENT_DB = self.DB_SYSTEM
-            self.schemas = self.schemas_system
-
-            self.insert_data("serials", [f":{table_name}:2"], True)
-
-            self.CURRENT_DB = tmp_db
-            self.schemas = tmp_schemas
+            self._create_sequence(table_name)
 
 
 
@@ -0,0 +1,149 @@
+from bisect import bisect_left, bisect_right
+
+
+class HashIndex:
+    def __init__(self, column: str, normalize=None):
+        self.column = column
+        self.normalize = normalize
+        self.keys = {}
+        self.unique = True
+
+    def build(self, records: list):
+        self.keys = {}
+        self.unique = True
+        for pos, record in enumerate(records):
+            self.add(record, pos)
+        return self
+
+    def add(self, record: dict, pos: int):
+        key = record.get(self.column)
+        if self.normalize is not None and key is not None:
+            try:
+                key = self.normalize(key)
+            except (TypeError, ValueError):
+                pass
+        if key in self.keys:
+            self.unique = False
+        self.keys[key] = pos
+
+    def add_all(self, records: list, start: int):
+        for offset, record in enumerate(records):
+            self.add(record, start + offset)
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys
+
+    def lookup(self, raw_value: str) -> list:
+        positions = []
+        for key in index_keys(raw_value):
+            pos = self.keys.get(key)
+            if pos is not None and pos not in positions:
+                positions.append(pos)
+        return sorted(positions)
+
+
+def index_keys(raw_value: str) -> list:
+    target_str = raw_value.strip("'").strip('"')
+    keys = [target_str]
+    try:
+        keys.append(float(target_str))
+    except ValueError:
+        pass
+    return keys
+
+
+class SortedIndex:
+    def __init__(self, name: str, column: str):
+        self.name = name
+        self.column = column
+        self.keys = []
+        self.positions = []
+        self.numeric = False
+        self.usable = True
+
+    def build(self, records: list):
+        pairs = [
+            (record.get(self.column), pos)
+            for pos, record in enumerate(records)
+            if record.get(self.column) is not None
+        ]
+        self.usable = True
+        try:
+            pairs.sort()
+        except TypeError:
+            self.usable = False
+            pairs = []
+
+        self.keys = [key for key, _ in pairs]
+        self.positions = [pos for _, pos in pairs]
+        self.numeric = bool(self.keys) and isinstance(self.keys[0], (int, float))
+        return self
+
+    def add(self, record: dict, pos: int):
+        key = record.get(self.column)
+        if key is None or not self.usable:
+            return
+        if self.keys and isinstance(key, (int, float)) != self.numeric:
+            self.usable = False
+            return
+
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.positions.insert(i, pos)
+        self.numeric = isinstance(self.keys[0], (int, float))
+
+    def add_all(self, records: list, start: int):
+        if len(records) == 1:
+            self.add(records[0], start)
+            return
+        if not self.usable:
+            return
+
+        pairs = [
+            (record.get(self.column), start + offset)
+            for offset, record in enumerate(records)
+            if record.get(self.column) is not None
+        ]
+        if not pairs:
+            return
+        numeric = self.numeric if self.keys else isinstance(pairs[0][0], (int, float))
+        if any(isinstance(key, (int, float)) != numeric for key, _ in pairs):
+            self.usable = False
+            return
+
+        pairs = list(zip(self.keys, self.positions)) + pairs
+        try:
+            pairs.sort()
+        except TypeError:
+            self.usable = False
+            return
+        self.keys = [key for key, _ in pairs]
+        self.positions = [pos for _, pos in pairs]
+        self.numeric = numeric
+
+    def lookup(self, operator: str, raw_value: str):
+        if not self.usable or operator not in RANGE_OPERATORS:
+            return None
+
+        target = raw_value.strip("'").strip('"')
+        if self.numeric:
+            try:
+                target = float(target)
+            except ValueError:
+                return None
+
+        if operator == '==':
+            lo, hi = bisect_left(self.keys, target), bisect_right(self.keys, target)
+        elif operator == '>':
+            lo, hi = bisect_right(self.keys, target), len(self.keys)
+        elif operator == '>=':
+            lo, hi = bisect_left(self.keys, target), len(self.keys)
+        elif operator == '<':
+            lo, hi = 0, bisect_left(self.keys, target)
+        else:
+            lo, hi = 0, bisect_right(self.keys, target)
+
+        return sorted(self.positions[lo:hi])
+
+
+RANGE_OPERATORS = ('==', '>', '>=', '<', '<=')
@@ -0,0 +1,58 @@
+NUMERIC_COLUMN_TYPES = ('integer', 'float')
+
+
+def key_function(left_type: str, right_type: str):
+    if left_type in NUMERIC_COLUMN_TYPES and right_type in NUMERIC_COLUMN_TYPES:
+        def key(value):
+            if value is None or isinstance(value, (int, float)):
+                return value
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return value
+        return key
+
+    return lambda value: None if value is None else str(value)
+
+
+def hash_join(build, probe):
+    table = {}
+    for pos, key in build:
+        if key is None:
+            continue
+        bucket = table.get(key)
+        if bucket is None:
+            table[key] = [pos]
+        else:
+            bucket.append(pos)
+
+    for probe_pos, key in probe:
+        matches = table.get(key)
+        if matches:
+            for build_pos in matches:
+                yield build_pos, probe_pos
+
+
+def merge_join(left, right):
+    left, right = iter(left), iter(right)
+    left_item, right_item = next(left, None), next(right, None)
+
+    while left_item is not None and right_item is not None:
+        left_key, right_key = left_item[0], right_item[0]
+        if left_key < right_key:
+            left_item = next(left, None)
+        elif left_key > right_key:
+            right_item = next(right, None)
+        else:
+            left_group = []
+            while left_item is not None and left_item[0] == left_key:
+                left_group.append(left_item[1])
+                left_item = next(left, None)
+            right_group = []
+            while right_item is not None and right_item[0] == right_key:
+                right_group.append(right_item[1])
+                right_item = next(right, None)
+
+            for left_pos in left_group:
+                for right_pos in right_group:
+                    yield left_pos, right_pos
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class RWLock:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.readers = {}
+        self.writer = None
+        self.write_count = 0
+        self.waiting_writers = 0
+
+    def acquire_read(self, timeout: float = None) -> bool:
+        me = threading.get_ident()
+        with self.cond:
+            if self.writer == me or me in self.readers:
+                self.readers[me] = self.readers.get(me, 0) + 1
+                return True
+
+            if not self.cond.wait_for(lambda: self.writer is None and not self.waiting_writers, timeout):
+                return False
+            self.readers[me] = 1
+            return True
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self.cond:
+            count = self.readers[me] - 1
+            if count:
+                self.readers[me] = count
+            else:
+                del self.readers[me]
+                self.cond.notify_all()
+
+    def acquire_write(self, timeout: float = None) -> bool:
+        me = threading.get_ident()
+        with self.cond:
+            if self.writer == me:
+                self.write_count += 1
+                return True
+            if me in self.readers:
+                raise RuntimeError("Impossible de passer d'un verrou en lecture à un verrou en écriture.")
+
+            self.waiting_writers += 1
+            try:
+                acquired = self.cond.wait_for(lambda: self.writer is None and not self.readers, timeout)
+            finally:
+                self.waiting_writers -= 1
+                if not self.waiting_writers:
+                    self.cond.notify_all()
+            if not acquired:
+                return False
+
+            self.writer = me
+            self.write_count = 1
+            return True
+
+    def release_write(self):
+        with self.cond:
+            self.write_count -= 1
+            if not self.write_count:
+                self.writer = None
+                self.cond.notify_all()
+
+
+class TableLock:
+    def __init__(self, path: str):
+        self.path = path
+        self.rw = RWLock()
+        self.mutex = threading.Lock()
+        self.fd = None
+        self.holders = 0
+
+    def acquire(self, exclusive: bool, timeout: float):
+        deadline = time.monotonic() + timeout
+        acquired = self.rw.acquire_write(timeout) if exclusive else self.rw.acquire_read(timeout)
+        if not acquired:
+            raise TimeoutError(f"Verrou indisponible après {timeout}s : {self.path}")
+
+        try:
+            with self.mutex:
+                if not self.holders:
+                    self._lock_file(exclusive, deadline, timeout)
+                self.holders += 1
+        except BaseException:
+            self._release_rw(exclusive)
+            raise
+
+    def release(self, exclusive: bool):
+        with self.mutex:
+            self.holders -= 1
+            if not self.holders and self.fd is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+                os.close(self.fd)
+                self.fd = None
+        self._release_rw(exclusive)
+
+    def _release_rw(self, exclusive: bool):
+        if exclusive:
+            self.rw.release_write()
+        else:
+            self.rw.release_read()
+
+    def _lock_file(self, exclusive: bool, deadline: float, timeout: float):
+        if fcntl is None:
+            return
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        operation = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, operation)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Verrou indisponible après {timeout}s : {self.path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        self.fd = fd
+
+
+class LockManager:
+    def __init__(self):
+        self.mutex = threading.Lock()
+        self.locks = {}
+
+    def get(self, path: str) -> TableLock:
+        with self.mutex:
+            lock = self.locks.get(path)
+            if lock is None:
+                lock = self.locks[path] = TableLock(path)
+            return lock
+
+
+TABLE_LOCKS = LockManager()
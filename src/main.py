@@ -1,9 +1,31 @@
+import argparse
+import re
+import sys
+import time
+
 from db_core import db_core
+from plan import PreparedStatement
+from profiling import Profile
 from user import user
 
 
 DB_NAME = "realDB"
-PERMISSION  = {}
+
+
+class Session:
+    def __init__(self, core, account):
+        self.db_core = core
+        self.user = account
+        self.permission = {}
+        self.error = None
+        self.prepared = {}
+        self.timing = False
+
+
+CLI_SESSION = Session(db_core, user)
+EXECUTE_PATTERN = re.compile(r"^(\w+)\s*(?:\((.*)\))?$")
+VALUE_PATTERN = re.compile(r"""\s*('[^']*'|"[^"]*"|[^,'"]*?)\s*(,|$)""")
+
 
 def parse_command(command: str) -> tuple[str, list[str]]:
     if not command:
@@ -17,10 +39,72 @@ def parse_command(command: str) -> tuple[str, list[str]]:
     
     return action, args
 
-def execute_command(action: str, args: list[str]) -> bool:
+def parse_execute(args: list[str]) -> tuple[str, list[str]]:
+    match = EXECUTE_PATTERN.match(" ".join(args))
+    if match is None:
+        raise SyntaxError("Synthaxe incorrecte : EXECUTE <nom>(<valeur>, ...)")
+
+    name, values = match.groups()
+    if not values or not values.strip():
+        return name, []
+
+    parsed = []
+    position = 0
+    while True:
+        match = VALUE_PATTERN.match(values, position)
+        if match is None:
+            raise SyntaxError("Synthaxe incorrecte : EXECUTE <nom>(<valeur>, ...)")
+        value, separator = match.groups()
+        parsed.append(value[1:-1] if value[:1] in ("'", '"') else value)
+        if not separator:
+            return name, parsed
+        position = match.end()
+
+def bind_prepared(args: list[str], session: Session) -> tuple[str, list[str]]:
+    name, values = parse_execute(args)
+    statement = session.prepared.get(name)
+    if statement is None:
+        raise ValueError(f"Instruction préparée '{name}' inconnue.")
+    return statement.action, statement.bind(values)
+
+SELECT_CLAUSES = ("GROUP", "ORDER", "LIMIT", "OFFSET")
+
+def split_select_clauses(args: list[str]) -> tuple[list[str], dict]:
+    clauses = {"group_by": None, "order_by": None, "descending": False, "limit": None, "offset": 0}
+    start = next((i for i, arg in enumerate(args) if i > 2 and arg.upper() in SELECT_CLAUSES), len(args))
+    tail = args[start:]
+    args = args[:start]
+
+    i = 0
+    while i < len(tail):
+        keyword = tail[i].upper()
+        if keyword in ("GROUP", "ORDER"):
+            if i + 2 >= len(tail) or tail[i + 1].upper() != "BY":
+                raise SyntaxError(f"Synthaxe incorrecte : {keyword} BY <colonne>")
+            column = tail[i + 2]
+            i += 3
+            if keyword == "GROUP":
+                clauses["group_by"] = column
+                continue
+            clauses["order_by"] = column
+            if i < len(tail) and tail[i].upper() in ("ASC", "DESC"):
+                clauses["descending"] = tail[i].upper() == "DESC"
+                i += 1
+        elif keyword in ("LIMIT", "OFFSET") and i + 1 < len(tail) and tail[i + 1].isdigit():
+            clauses["limit" if keyword == "LIMIT" else "offset"] = int(tail[i + 1])
+            i += 2
+        else:
+            raise SyntaxError(f"Synthaxe incorrecte près de : {tail[i]}")
+
+    return args, clauses
+
+def execute_command(action: str, args: list[str], session: Session = CLI_SESSION) -> bool:
     
-    global PERMISSION
+    db_core, user = session.db_core, session.user
+    PERMISSION = session.permission
     if action == "QUIT" or action == "EXIT":
+        if db_core.transaction is not None:
+            db_core.rollback()
         print(f"Fermeture de {DB_NAME}.")
         return False
     
@@ -41,12 +125,30 @@ def execute_command(action: str, args: list[str]) -> bool:
             "    SHOW TABLES ............. Liste toutes les tables de la DB active.\n"
             "    DESCRIBE <table_name> ......Liste toutes les champq de la table.\n"
             "    DROP TABLE <nom> ...........Supprimer une table.\n"
+            "    CREATE INDEX <nom> ON <table>(<colonne>) Crée un index trié sur une colonne.\n"
+            "    DROP INDEX <nom> ...........Supprimer un index.\n"
             "    CREATE TABLE <nom> <champs> Crée une nouvelle table (ex: id:int:pk name:str).\n"
             "    INSERT INTO <table_nom> <valeurs> Insère une ligne dans la table.\n"
             "    SELECT * FROM <table_nom> .. Affiche toutes les données de la table.\n"
             "    SELECT * FROM <table_nom> WHERE <condition>.. Affiche toutes les données de la table.\n"
+            "    SELECT <col>,COUNT(*),SUM(<col>) FROM <table_nom> [WHERE <condition>] GROUP BY <col> Agrège les lignes (COUNT, SUM, AVG, MIN, MAX).\n"
+            "    SELECT <cols> FROM <a> JOIN <b> ON <a>.<col>=<b>.<col> [WHERE <condition>] Joint deux tables.\n"
+            "    SELECT ... [ORDER BY <col> [ASC|DESC]] [LIMIT <n>] [OFFSET <m>] Trie et pagine le résultat.\n"
             "    UPDATE <nom> SET <col> = <val> WHERE <cond> Modifie des lignes.\n"
             "    DELETE FROM <nom> WHERE <cond> Supprime des lignes.\n"
+            "    EXPORT TABLE <nom> ........ Exporte la table vers <nom>_data.json.\n"
+            "    IMPORT TABLE <nom> ........ Charge <nom>_data.json dans le journal de la table.\n"
+            "    CONVERT TABLE <nom> TO <json|log|binary|fixed> Change le format de fichier de la table.\n"
+            "    SET STORAGE <json|log|binary|fixed> Format par défaut des nouvelles tables de la base.\n"
+            "    MIGRATE TABLE <nom> / ALL . Convertit les valeurs stockées vers le type de leur colonne.\n"
+            "    BEGIN / COMMIT / ROLLBACK . Regroupe les modifications en une transaction.\n"
+            "    PREPARE <nom> AS <instruction> Prépare une instruction, '?' marque un paramètre.\n"
+            "    EXECUTE <nom>(<valeur>, ...) Exécute une instruction préparée.\n"
+            "    DEALLOCATE <nom> .......... Supprime une instruction préparée.\n"
+            "    SET COLUMNAR ON/OFF ....... Active la représentation colonnaire pour les SELECT.\n"
+            "    EXPLAIN <instruction> ..... Affiche le plan d'accès sans exécuter l'instruction.\n"
+            "    EXPLAIN ANALYZE <instruction> Exécute l'instruction et détaille le temps par phase.\n"
+            "    \\timing [on|off] .......... Affiche la durée de chaque instruction.\n"
             " \n"
             "    GRANT/REVOKE <CREATE/READ/DELETE> ON <DATABASE> TO <USER>......Modifier les permmissions des utilisateurs sur une base."
             "    CREATE USER <USERNAME> IDENTIFIED BY <PASSWORD>......Créer un nouveau utilisateur."
@@ -58,7 +160,7 @@ def execute_command(action: str, args: list[str]) -> bool:
     try:
         if action == "USE" and len(args) == 1:
             db_core.use_db(args[0])
-            PERMISSION = get_perms()
+            PERMISSION = session.permission = get_perms(session)
 
         elif action == "CREATE" and len(args) >= 2:
             if args[0].upper() == "DATABASE":
@@ -75,6 +177,20 @@ def execute_command(action: str, args: list[str]) -> bool:
                 else:
                     print("Permission non accordé.")
 
+            elif args[0].upper() == "INDEX":
+                if db_core.CURRENT_DB:
+                    if PERMISSION["c"]:
+                        target = "".join(args[3:])
+                        if len(args) >= 4 and args[2].upper() == "ON" and target.endswith(")") and "(" in target:
+                            table_name, column = target[:-1].split("(", 1)
+                            db_core.create_index(args[1], table_name, column)
+                        else:
+                            print("Erreur de synthaxe : CREATE INDEX <nom> ON <table>(<colonne>)")
+                    else:
+                        print("Permission non accordé.")
+                else:
+                    print("Erreur: Aucune base de données sélectionnée.")
+
             elif args[0].upper() == "TABLE":
                 
                 if db_core.CURRENT_DB:
@@ -126,7 +242,7 @@ def execute_command(action: str, args: list[str]) -> bool:
             else:
                     print("Erreur: Aucune base de données sélectionnée.")
 
-        elif action == "ALTER" and :
+        elif action == "ALTER":
             if db_core.CURRENT_DB:
                 if PERMISSION["u"]:
                     if len(args) == 4 and args[1].upper() == "SET" and args[3].upper() == "ALL":
@@ -184,8 +300,16 @@ def execute_command(action: str, args: list[str]) -> bool:
                         print("Permission non accordé.")
                 else:
                     print("Erreur: Aucune base de données sélectionnée.")
+            elif args[0].upper() == "INDEX":
+                if db_core.CURRENT_DB:
+                    if PERMISSION["d"]:
+                        db_core.drop_index(args[1])
+                    else:
+                        print("Permission non accordé.")
+                else:
+                    print("Erreur: Aucune base de données sélectionnée.")
             else:
-                print(f"Erreur de synthaxe : DROP TABLE/DATABASE <DATABASENAME/TABLENAME>")
+                print(f"Erreur de synthaxe : DROP TABLE/DATABASE/INDEX <DATABASENAME/TABLENAME/INDEXNAME>")
 
 
         elif action == "INSERT" and len(args) >= 3 and args[0].upper() == "INTO":
@@ -204,13 +328,20 @@ def execute_command(action: str, args: list[str]) -> bool:
             if db_core.CURRENT_DB:
 
                 if PERMISSION["r"]:
-                    if len(args) == 3 and args[1].upper() == "FROM":
+                    args, clauses = split_select_clauses(args)
+
+                    if len(args) >= 7 and args[1].upper() == "FROM" and args[3].upper() == "JOIN" and args[5].upper() == "ON":
+                        where = next((i for i, arg in enumerate(args) if i > 5 and arg.upper() == "WHERE"), len(args))
+                        on = "".join(args[6:where])
+                        condition = args[where + 1:]
+                        db_core.select_join(args[2], args[4], on, condition, args[0], **clauses)
+                    elif len(args) == 3 and args[1].upper() == "FROM":
                         table_name = args[2]
-                        db_core.select_data(table_name, "", args[0])
+                        db_core.select_data(table_name, "", args[0], **clauses)
                     elif len(args) >= 5  and args[1].upper() == "FROM" and args[3].upper() == "WHERE":
                         condition = args[4:]
                         table_name = args[2]
-                        db_core.select_data(table_name, condition, args[0])
+                        db_core.select_data(table_name, condition, args[0], **clauses)
                     else:
                         print("Erreur de syntaxe: SELECT * FROM <table_name>")
                 else:
@@ -219,6 +350,109 @@ def execute_command(action: str, args: list[str]) -> bool:
                 print("Erreur: Aucune base de données sélectionnée.")
 
 
+        elif action in ("EXPORT", "IMPORT") and len(args) == 2 and args[0].upper() == "TABLE":
+            if db_core.CURRENT_DB:
+                if action == "EXPORT" and PERMISSION["r"]:
+                    db_core.export_table(args[1])
+                elif action == "IMPORT" and PERMISSION["c"]:
+                    db_core.import_table(args[1])
+                else:
+                    print("Permission non accordé.")
+            else:
+                print("Erreur: Aucune base de données sélectionnée.")
+
+        elif action == "CONVERT" and len(args) == 4 and args[0].upper() == "TABLE" and args[2].upper() == "TO":
+            if db_core.CURRENT_DB:
+                if PERMISSION["u"]:
+                    db_core.convert_table(args[1], args[3].lower())
+                else:
+                    print("Permission non accordé.")
+            else:
+                print("Erreur: Aucune base de données sélectionnée.")
+
+        elif action == "SET" and len(args) == 2 and args[0].upper() == "STORAGE":
+            if db_core.CURRENT_DB:
+                if PERMISSION["c"]:
+                    db_core.set_storage(args[1].lower())
+                else:
+                    print("Permission non accordé.")
+            else:
+                print("Erreur: Aucune base de données sélectionnée.")
+
+        elif action == "MIGRATE" and args and (args[0].upper() == "ALL" and len(args) == 1 or args[0].upper() == "TABLE" and len(args) == 2):
+            if db_core.CURRENT_DB:
+                if PERMISSION["u"]:
+                    if args[0].upper() == "ALL":
+                        db_core.migrate_tables()
+                    else:
+                        db_core.migrate_table(args[1])
+                else:
+                    print("Permission non accordé.")
+            else:
+                print("Erreur: Aucune base de données sélectionnée.")
+
+        elif action in ("BEGIN", "COMMIT", "ROLLBACK") and not args:
+            if action == "BEGIN":
+                db_core.begin()
+            elif action == "COMMIT":
+                db_core.commit()
+            else:
+                db_core.rollback()
+
+        elif action == "PREPARE" and len(args) >= 3 and args[1].upper() == "AS":
+            statement_action = args[2].upper()
+            if statement_action in ("PREPARE", "EXECUTE", "DEALLOCATE"):
+                print(f"Erreur: {statement_action} ne peut pas être préparé.")
+            else:
+                statement = session.prepared[args[0]] = PreparedStatement(statement_action, args[3:])
+                print(f"Instruction '{args[0]}' préparée ({statement.parameters} paramètre(s)).")
+
+        elif action == "EXECUTE" and args:
+            return execute_command(*bind_prepared(args, session), session)
+
+        elif action == "EXPLAIN" and args:
+            analyze = args[0].upper() == "ANALYZE"
+            statement = args[1:] if analyze else args
+            if not statement:
+                print("Erreur de synthaxe : EXPLAIN [ANALYZE] <instruction>")
+            elif analyze:
+                if db_core.profile is not None or statement[0].upper() == "EXPLAIN" and statement[1:2] and statement[1].upper() == "ANALYZE":
+                    raise ValueError("EXPLAIN ANALYZE ne peut pas être imbriqué.")
+                profile = db_core.profile = Profile()
+                try:
+                    running = execute_command(statement[0].upper(), statement[1:], session)
+                finally:
+                    db_core.profile = None
+                for line in profile.report():
+                    print(line)
+                return running
+            elif db_core.CURRENT_DB:
+                if PERMISSION["r"]:
+                    explain_statement(statement[0].upper(), statement[1:], session)
+                else:
+                    print("Permission non accordé.")
+            else:
+                print("Erreur: Aucune base de données sélectionnée.")
+
+        elif action == "\\TIMING" and len(args) <= 1:
+            if args and args[0].upper() not in ("ON", "OFF"):
+                print("Erreur de synthaxe : \\timing [on|off]")
+            else:
+                session.timing = args[0].upper() == "ON" if args else not session.timing
+                print(f"Chronométrage {'activé' if session.timing else 'désactivé'}.")
+
+        elif action == "DEALLOCATE" and len(args) == 1:
+            if session.prepared.pop(args[0], None) is None:
+                print(f"Instruction préparée '{args[0]}' inconnue.")
+            else:
+                print(f"Instruction '{args[0]}' supprimée.")
+
+        elif action == "SET" and len(args) == 2 and args[0].upper() == "COLUMNAR":
+            if args[1].upper() in ("ON", "OFF"):
+                db_core.set_columnar(args[1].upper() == "ON")
+            else:
+                print("Erreur de synthaxe : SET COLUMNAR ON/OFF")
+
         elif action == "SHOW" and len(args) == 1:
             if args[0].upper() == "DATABASES":
                 db_core.show_databases()
@@ -239,7 +473,7 @@ def execute_command(action: str, args: list[str]) -> bool:
         elif action == "SU" and len(args) == 1:
             user.switch_user(args[0])
             if db_core.CURRENT_DB:
-                PERMISSION = get_perms()
+                PERMISSION = session.permission = get_perms(session)
 
 
         elif action == "DESCRIBE" and len(args) == 1:
@@ -255,11 +489,42 @@ def execute_command(action: str, args: list[str]) -> bool:
             print(f" Erreur: Commande non reconnue ou syntaxe incorrecte: {action}")
 
     except Exception as e:
+        session.error = e
         print(f"Erreur lors de l'exécution de la commande: {e}")
         
     return True
 
-def get_perms():
+def explain_statement(action: str, args: list[str], session: Session = CLI_SESSION):
+    db_core = session.db_core
+    if action == "EXECUTE" and args:
+        action, args = bind_prepared(args, session)
+
+    if action == "SELECT":
+        args, clauses = split_select_clauses(args)
+        if len(args) >= 7 and args[1].upper() == "FROM" and args[3].upper() == "JOIN" and args[5].upper() == "ON":
+            where = next((i for i, arg in enumerate(args) if i > 5 and arg.upper() == "WHERE"), len(args))
+            db_core.explain(args[2])
+            db_core.explain(args[4])
+            print(f"Jointure : {args[2]} JOIN {args[4]} ON {''.join(args[6:where])}")
+        elif len(args) == 3 and args[1].upper() == "FROM":
+            db_core.explain(args[2], None, clauses["order_by"], clauses["limit"])
+        elif len(args) >= 5 and args[1].upper() == "FROM" and args[3].upper() == "WHERE":
+            db_core.explain(args[2], args[4:], clauses["order_by"], clauses["limit"])
+        else:
+            print("Erreur de syntaxe: SELECT * FROM <table_name>")
+    elif action == "UPDATE" and len(args) >= 4 and args[1].upper() == "SET":
+        db_core.explain(args[0], args[4:] if args[3].upper() == "WHERE" else None, write="update")
+    elif action == "DELETE" and len(args) > 3 and args[0].upper() == "FROM" and args[2].upper() == "WHERE":
+        db_core.explain(args[1], args[3:], write="delete")
+    elif action == "DELETE" and len(args) == 3 and args[0] == "*" and args[1].upper() == "FROM":
+        db_core.explain(args[2], write="delete")
+    elif action == "INSERT" and len(args) >= 3 and args[0].upper() == "INTO":
+        db_core.explain(args[1], write="insert")
+    else:
+        print("Erreur: EXPLAIN s'applique à SELECT, INSERT, UPDATE et DELETE.")
+
+def get_perms(session: Session = CLI_SESSION):
+    db_core, user = session.db_core, session.user
     create_p = user.has_permission(db_core.CURRENT_DB, "c")
     read_p = user.has_permission(db_core.CURRENT_DB, "r")
     delete_p = user.has_permission(db_core.CURRENT_DB, "d")
@@ -267,6 +532,95 @@ def get_perms():
     
     return {"c": create_p, "r": read_p, "d": delete_p, "u":update_p}
 
+def parse_script(text: str) -> list[tuple[int, str]]:
+    statements = []
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        statement = line.strip().rstrip(";").strip()
+        if statement and not statement.startswith("--"):
+            statements.append((line_no, statement))
+    return statements
+
+def statement_table(action: str, args: list[str], session: Session = CLI_SESSION) -> str | None:
+    if action == "EXECUTE" and args:
+        try:
+            name, values = parse_execute(args)
+        except SyntaxError:
+            return None
+        statement = session.prepared.get(name)
+        if statement is None:
+            return None
+        action, args = statement.action, list(statement.args)
+    if action == "INSERT" and len(args) >= 3 and args[0].upper() == "INTO":
+        return args[1]
+    if action == "UPDATE" and len(args) >= 4:
+        return args[0]
+    if action == "DELETE" and len(args) >= 3:
+        if args[0].upper() == "FROM":
+            return args[1]
+        if args[0] == "*" and args[1].upper() == "FROM":
+            return args[2]
+    return None
+
+def run_script(statements: list[tuple[int, str]], session: Session = CLI_SESSION, report=sys.stderr) -> int:
+    db_core = session.db_core
+    parsed = [(line_no, statement, *parse_command(statement)) for line_no, statement in statements]
+    errors = 0
+    started = time.perf_counter()
+
+    i = 0
+    running = True
+    while running and i < len(parsed):
+        table = statement_table(parsed[i][2], parsed[i][3], session)
+        end = i + 1
+        if table and db_core.transaction is None:
+            while end < len(parsed) and statement_table(parsed[end][2], parsed[end][3], session) == table:
+                end += 1
+        grouped = end - i > 1
+
+        if grouped:
+            db_core.begin(verbose=False)
+        for line_no, statement, action, args in parsed[i:end]:
+            session.error = None
+            start = time.perf_counter()
+            running = execute_command(action, args, session)
+            elapsed = time.perf_counter() - start
+            if session.error is not None:
+                errors += 1
+            print(f"-- [{line_no}] {elapsed * 1000:.2f} ms : {statement}", file=report)
+            if not running:
+                break
+        if grouped and db_core.transaction is not None:
+            start = time.perf_counter()
+            try:
+                db_core.commit(verbose=False)
+            except Exception as e:
+                errors += 1
+                print(f"Erreur lors de l'écriture du groupe '{table}' : {e}")
+            elapsed = time.perf_counter() - start
+            print(f"-- écriture de '{table}' ({end - i} instructions) : {elapsed * 1000:.2f} ms", file=report)
+        i = end
+
+    total = time.perf_counter() - started
+    print(f"-- {len(parsed)} instruction(s), {errors} erreur(s), {total:.3f} s", file=report)
+    return errors
+
+def run_batch(text: str, user_name: str, password: str, assume_yes: bool) -> int:
+    if not user_name or not user.valid_user(user_name, password or ""):
+        print("Mode script : --user et --password valides sont requis.")
+        return 1
+
+    user.user = user_name
+    user.user_permission = user.get_permission(user_name)
+    db_core.ASSUME_YES = assume_yes
+    db_core.load_db()
+
+    errors = run_script(parse_script(text))
+    if db_core.transaction is not None:
+        print("Transaction non terminée en fin de script : annulation.")
+        db_core.rollback()
+        errors += 1
+    return 1 if errors else 0
+
 def start_cli():
 
     if not user.user:
@@ -289,7 +643,10 @@ def start_cli():
                 continue
 
             action, args = parse_command(user_input)
+            start = time.perf_counter()
             running = execute_command(action, args)
+            if CLI_SESSION.timing and action != "\\TIMING":
+                print(f"Temps : {(time.perf_counter() - start) * 1000:.3f} ms")
             
         except EOFError:
             print("\nAu revoir! (CTRL+D)")
@@ -300,4 +657,25 @@ def start_cli():
 
 
 if __name__ == "__main__":
-    start_cli()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=f"{DB_NAME}")
+    parser.add_argument("--serve", action="store_true", help="Démarre le serveur réseau au lieu de la console.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5454)
+    parser.add_argument("--file", help="Exécute les instructions du fichier (une par ligne) puis quitte.")
+    parser.add_argument("--yes", action="store_true", help="Répond 'oui' aux confirmations (DROP).")
+    parser.add_argument("--user", help="Utilisateur pour le mode script.")
+    parser.add_argument("--password", help="Mot de passe pour le mode script.")
+    options = parser.parse_args()
+
+    if options.serve:
+        from server import serve
+        serve(options.host, options.port)
+    elif options.file or not sys.stdin.isatty():
+        if options.file:
+            with open(options.file, 'r', encoding='utf-8') as f:
+                script = f.read()
+        else:
+            script = sys.stdin.read()
+        sys.exit(run_batch(script, options.user, options.password, options.yes))
+    else:
+        start_cli()
\ No newline at end of file
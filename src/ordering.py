@@ -0,0 +1,52 @@
+import heapq
+from itertools import groupby, islice
+
+
+NUMERIC_COLUMN_TYPES = ('integer', 'float')
+
+
+def sort_key(column: str, column_type: str = None, descending: bool = False):
+    null_rank = -1 if descending else 2
+    numeric = column_type in NUMERIC_COLUMN_TYPES
+
+    def key(record):
+        value = record.get(column)
+        if value is None:
+            return (null_rank, 0)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (0, value)
+        if numeric:
+            try:
+                return (0, float(value))
+            except (TypeError, ValueError):
+                pass
+        return (1, str(value))
+    return key
+
+
+def order_rows(rows, key, descending: bool = False, limit: int = None, offset: int = 0) -> list:
+    if limit is None:
+        ordered = sorted(rows, key=key, reverse=descending)
+        return ordered[offset:]
+
+    bound = offset + limit
+    if descending:
+        ordered = heapq.nlargest(bound, rows, key=key)
+    else:
+        ordered = heapq.nsmallest(bound, rows, key=key)
+    return ordered[offset:]
+
+
+def index_order(index, descending: bool = False):
+    if not descending:
+        return iter(index.positions)
+
+    keys, positions = index.keys, index.positions
+    runs = groupby(range(len(keys) - 1, -1, -1), key=keys.__getitem__)
+    return (positions[i] for _, run in runs for i in reversed(list(run)))
+
+
+def paginate(rows, limit: int = None, offset: int = 0):
+    if limit is None:
+        return islice(rows, offset, None)
+    return islice(rows, offset, offset + limit)
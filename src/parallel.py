@@ -0,0 +1,112 @@
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from predicate import compile_condition
+
+
+_RECORDS = None
+_FORK_ALLOWED = True
+
+
+def free_threaded() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def default_workers() -> int:
+    if hasattr(os, "process_cpu_count"):
+        return os.process_cpu_count() or 1
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+
+def _ranges(total: int, parts: int) -> list:
+    size = max(1, -(-total // parts))
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def _scan_records(records: list, start: int, end: int, condition_list: list, schema: dict) -> list:
+    predicate = compile_condition(condition_list, schema)
+    return [pos for pos in range(start, end) if predicate(records[pos])]
+
+
+def _inherit(records: list):
+    global _RECORDS
+    _RECORDS = records
+
+
+def _scan_inherited(start: int, end: int, condition_list: list, schema: dict) -> list:
+    return _scan_records(_RECORDS, start, end, condition_list, schema)
+
+
+def parallel_positions(records: list, condition_list: list, schema: dict, workers: int) -> list:
+    ranges = _ranges(len(records), workers)
+    if free_threaded():
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            chunks = pool.map(lambda bounds: _scan_records(records, *bounds, condition_list, schema), ranges)
+            return [pos for chunk in chunks for pos in chunk]
+
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_inherit, initargs=(records,)) as pool:
+        futures = [pool.submit(_scan_inherited, start, end, condition_list, schema) for start, end in ranges]
+        return [pos for future in futures for pos in future.result()]
+
+
+def _scan_log(path: str, start: int, end: int, condition_list: list, schema: dict) -> list:
+    predicate = compile_condition(condition_list, schema)
+    rows = []
+    with open(path, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        offset = f.tell()
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                if f.read(1):
+                    raise
+                break
+            if entry.get("op") != "insert":
+                raise ValueError("Le journal contient des modifications, lecture en flux impossible.")
+            if predicate(entry["row"]):
+                rows.append(entry["row"])
+    return rows
+
+
+def estimate_lines(path: str, sample_size: int = 65536) -> int:
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+    if not sample:
+        return 0
+    return size * max(sample.count(b"\n"), 1) // len(sample)
+
+
+def parallel_log_rows(path: str, condition_list: list, schema: dict, workers: int) -> list:
+    ranges = _ranges(os.path.getsize(path), workers)
+    if free_threaded():
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            chunks = pool.map(lambda bounds: _scan_log(path, *bounds, condition_list, schema), ranges)
+            return [row for chunk in chunks for row in chunk]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_scan_log, path, start, end, condition_list, schema) for start, end in ranges]
+        return [row for future in futures for row in future.result()]
+
+
+def disable_fork():
+    global _FORK_ALLOWED
+    _FORK_ALLOWED = False
+
+
+def can_fork() -> bool:
+    return free_threaded() or (_FORK_ALLOWED and "fork" in multiprocessing.get_all_start_methods())
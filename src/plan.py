@@ -0,0 +1,155 @@
+import threading
+from collections import OrderedDict
+
+from predicate import BOOLEAN_VALUES, BoundCondition, Predicate, build_predicate, compile_condition, parse_conditions
+
+
+PLACEHOLDER = "?"
+TEXT_SEPARATORS = (":", "=")
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def _to_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in BOOLEAN_VALUES:
+        return BOOLEAN_VALUES[value.lower()]
+    raise ValueError(value)
+
+
+def _to_integer(value):
+    if not isinstance(value, (int, str)):
+        raise ValueError(value)
+    return int(value)
+
+
+def _to_float(value):
+    if not isinstance(value, (int, float, str)):
+        raise ValueError(value)
+    return float(value)
+
+
+def _to_string(value):
+    if value is None:
+        raise ValueError(value)
+    return value
+
+
+CONVERTERS = {
+    'string': _to_string,
+    'integer': _to_integer,
+    'float': _to_float,
+    'boolean': _to_boolean,
+}
+
+
+class TablePlan:
+    def __init__(self, schema: dict, maxsize: int = 128):
+        self.schema = schema
+        self.fields = schema.get('fields', [])
+        self.types = {field['column']: field['type'] for field in self.fields}
+        self.converters = {column: CONVERTERS.get(column_type.lower()) for column, column_type in self.types.items()}
+        self.predicates = LRUCache(maxsize)
+        self.templates = LRUCache(maxsize)
+
+    def predicate(self, condition_list: list) -> Predicate:
+        if any(isinstance(cond, BoundCondition) for cond in condition_list):
+            return self._bound_predicate(condition_list)
+
+        key = tuple(condition_list)
+        predicate = self.predicates.get(key)
+        if predicate is None:
+            predicate = compile_condition(condition_list, self.schema)
+            self.predicates.put(key, predicate)
+        return predicate
+
+    def _bound_predicate(self, condition_list: list) -> Predicate:
+        key = tuple(cond.parts[:2] if isinstance(cond, BoundCondition) else cond for cond in condition_list)
+        template = self.templates.get(key)
+        if template is None:
+            template = parse_conditions(condition_list, self.types)
+            self.templates.put(key, template)
+
+        conditions, connectors = template
+        conditions = [
+            cond.parts if isinstance(cond, BoundCondition) else parsed
+            for cond, parsed in zip(condition_list[::2], conditions)
+        ]
+        return build_predicate(conditions, connectors, self.types)
+
+    def convert(self, column: str, value):
+        converter = self.converters.get(column)
+        if converter is None:
+            raise ValueError(f"Type inconnu pour la colonne {column}.")
+        try:
+            return converter(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Valeur '{value}' invalide pour la colonne {column} ({self.types[column]}).") from None
+
+    def convert_record(self, record: dict) -> int:
+        converted = 0
+        for column, value in record.items():
+            if value is None or column not in self.converters:
+                continue
+            typed = self.convert(column, value)
+            if type(typed) is not type(value) or typed != value:
+                record[column] = typed
+                converted += 1
+        return converted
+
+
+class PreparedStatement:
+    def __init__(self, action: str, args: list):
+        self.action = action
+        self.args = tuple(args)
+        self.parameters = sum(arg.count(PLACEHOLDER) for arg in args)
+        where = next((i for i, arg in enumerate(args) if arg.upper() == "WHERE"), len(args))
+        self.slots = {}
+        for i, arg in enumerate(args[where + 1:], start=where + 1):
+            parts = arg.split(":")
+            if len(parts) == 3 and parts[2] == PLACEHOLDER and PLACEHOLDER not in parts[0] + parts[1]:
+                self.slots[i] = (parts[0], parts[1])
+
+    def bind(self, values: list) -> list:
+        if len(values) != self.parameters:
+            raise ValueError(f"{self.parameters} paramètre(s) attendu(s), {len(values)} fourni(s).")
+
+        values = iter(values)
+        args = []
+        for i, arg in enumerate(self.args):
+            if i in self.slots:
+                arg = BoundCondition(*self.slots[i], next(values))
+            elif PLACEHOLDER in arg:
+                parts = arg.split(PLACEHOLDER)
+                arg = parts[0] + "".join(self._text(next(values)) + part for part in parts[1:])
+            args.append(arg)
+        return args
+
+    def _text(self, value: str) -> str:
+        if any(separator in value for separator in TEXT_SEPARATORS):
+            raise ValueError(f"Valeur de paramètre invalide : '{value}' ne peut pas contenir {' '.join(TEXT_SEPARATORS)}.")
+        return value
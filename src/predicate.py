@@ -0,0 +1,130 @@
+import operator
+
+
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+}
+
+NUMERIC_TYPES = (int, float)
+BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class Predicate:
+    def __init__(self, conditions: list, connectors: list, test):
+        self.conditions = conditions
+        self.connectors = connectors
+        self.test = test
+
+    def __call__(self, record: dict) -> bool:
+        return self.test(record)
+
+    @property
+    def conjunctive(self) -> bool:
+        return all(connector == "and" for connector in self.connectors)
+
+
+class BoundCondition(str):
+    def __new__(cls, column: str, op: str, value: str):
+        token = super().__new__(cls, f"{column}:{op}:{value}")
+        token.parts = (column, op, value)
+        return token
+
+    def __reduce__(self):
+        return (BoundCondition, self.parts)
+
+
+def parse_condition(cond: str, columns: list) -> tuple:
+    parts = cond.parts if isinstance(cond, BoundCondition) else cond.split(":")
+    if len(parts) != 3:
+        raise SyntaxError(f"Synthaxe de condition incorrect: <column>:<operateur>:<value>")
+
+    column, op, raw_value = parts
+    if column not in columns:
+        raise ValueError(f"Colonne inconnu: {column}.")
+    if op not in OPERATORS:
+        raise ValueError(f"Opérateur non supporté: {op}")
+
+    return column, op, raw_value
+
+
+def typed_target(raw_value: str, column_type: str, op: str) -> tuple:
+    target_str = raw_value.strip("'").strip('"')
+    if column_type == 'boolean':
+        target = BOOLEAN_VALUES.get(target_str.lower(), target_str)
+    else:
+        try:
+            target = float(target_str)
+        except ValueError:
+            target = target_str
+
+    if column_type in ('integer', 'float', 'boolean') and target is target_str and op not in ('==', '!='):
+        raise ValueError(f"Valeur '{target_str}' invalide pour la colonne de type {column_type}.")
+    return target_str, target
+
+
+def _compile_test(column: str, op: str, raw_value: str, column_type: str):
+    compare = OPERATORS[op]
+    target_str, target_num = typed_target(raw_value, column_type, op)
+
+    if column_type == 'string':
+        if op in ('==', '!='):
+            return lambda record: compare(record.get(column), target_str)
+
+        def test(record):
+            value = record.get(column)
+            return value is not None and compare(value, target_str)
+        return test
+
+    if op in ('==', '!='):
+        def test(record):
+            value = record.get(column)
+            return compare(value, target_num if isinstance(value, NUMERIC_TYPES) else target_str)
+        return test
+
+    def test(record):
+        value = record.get(column)
+        if value is None:
+            return False
+        return compare(value, target_num if isinstance(value, NUMERIC_TYPES) else target_str)
+    return test
+
+
+def _combine(left, connector: str, right):
+    if connector == "and":
+        return lambda record: left(record) and right(record)
+    return lambda record: left(record) or right(record)
+
+
+def parse_conditions(condition_list: list, types: dict) -> tuple:
+    if len(condition_list) % 2 == 0:
+        raise SyntaxError(f"Les conditions sont manquant. voir 'HELP'")
+
+    conditions = []
+    connectors = []
+    for i, cond in enumerate(condition_list):
+        if i % 2 == 1:
+            connector = cond.lower()
+            if connector not in ("and", "or"):
+                raise SyntaxError(f"Opérateur logique inconnu: {cond}. Utilisez AND ou OR.")
+            connectors.append(connector)
+        else:
+            conditions.append(parse_condition(cond, types))
+    return conditions, connectors
+
+
+def build_predicate(conditions: list, connectors: list, types: dict) -> Predicate:
+    test = None
+    for i, (column, op, raw_value) in enumerate(conditions):
+        cond_test = _compile_test(column, op, raw_value, types[column])
+        test = cond_test if test is None else _combine(test, connectors[i - 1], cond_test)
+    return Predicate(conditions, connectors, test)
+
+
+def compile_condition(condition_list: list, schema: dict) -> Predicate:
+    types = {field['column']: field['type'] for field in schema.get('fields', [])}
+    return build_predicate(*parse_conditions(condition_list, types), types)
@@ -0,0 +1,86 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+
+NO_PHASE = nullcontext()
+_END = object()
+
+COUNTERS = (
+    ("rows_scanned", "Lignes parcourues"),
+    ("rows_returned", "Lignes retournées"),
+    ("rows_written", "Lignes modifiées"),
+    ("bytes_read", "Octets lus"),
+    ("bytes_written", "Octets écrits"),
+)
+
+
+class Profile:
+    def __init__(self):
+        self.phases = {}
+        self.counters = dict.fromkeys((name for name, _ in COUNTERS), 0)
+        self.notes = []
+        self.nested = []
+        self.started = time.perf_counter()
+        self.elapsed = None
+
+    def _enter(self) -> float:
+        self.nested.append(0.0)
+        return time.perf_counter()
+
+    def _leave(self, name: str, start: float):
+        elapsed = time.perf_counter() - start
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed - self.nested.pop()
+        if self.nested:
+            self.nested[-1] += elapsed
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self._enter()
+        try:
+            yield
+        finally:
+            self._leave(name, start)
+
+    def timed(self, iterable, name: str):
+        iterator = iter(iterable)
+        while True:
+            start = self._enter()
+            try:
+                item = next(iterator, _END)
+            finally:
+                self._leave(name, start)
+            if item is _END:
+                return
+            yield item
+
+    def scanned(self, iterable):
+        counters = self.counters
+        for item in iterable:
+            counters["rows_scanned"] += 1
+            yield item
+
+    def note(self, text: str):
+        if text not in self.notes:
+            self.notes.append(text)
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    def report(self) -> list:
+        if self.elapsed is None:
+            self.stop()
+        lines = ["Plan exécuté :"]
+        lines += [f"  {note}" for note in self.notes] or ["  (aucun accès aux tables)"]
+
+        lines.append("Phases :")
+        width = max([len(name) for name in self.phases] + [len("autres")])
+        for name, seconds in self.phases.items():
+            lines.append(f"  {name.ljust(width)} {seconds * 1000:10.3f} ms")
+        other = self.elapsed - sum(self.phases.values())
+        if self.phases and other > 0:
+            lines.append(f"  {'autres'.ljust(width)} {other * 1000:10.3f} ms")
+        lines.append(f"  {'total'.ljust(width)} {self.elapsed * 1000:10.3f} ms")
+
+        for name, label in COUNTERS:
+            lines.append(f"{label} : {self.counters[name]}")
+        return lines
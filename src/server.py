@@ -0,0 +1,145 @@
+import asyncio
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from db_core import DBCore, db_core
+from main import DB_NAME, Session, execute_command, get_perms, parse_command
+from parallel import disable_fork
+from user import User
+
+
+class SessionOutput(io.TextIOBase):
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self, buffer):
+        self.local.buffer = buffer
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            return self.stream.write(text)
+        return buffer.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class SessionCore(DBCore):
+    def __init__(self, shared: DBCore):
+        super().__init__(shared.cache)
+        self.DATA_DIR = shared.DATA_DIR
+        self.STRUCTURE_DIR = shared.STRUCTURE_DIR
+        self.DATABASES = shared.DATABASES
+        self.plans = shared.plans
+        self.ASSUME_YES = True
+        self.results = []
+
+    def display_result(self, colname: list, resultat, chunk_size: int = None) -> int:
+        rows = [[record.get(name) for name in colname] for record in resultat]
+        self.results.append({"columns": list(colname), "rows": rows})
+        return len(rows)
+
+
+class ServerSession(Session):
+    def __init__(self, shared: DBCore, output: SessionOutput):
+        super().__init__(SessionCore(shared), User())
+        self.output = output
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def execute(self, command: str) -> tuple:
+        self.error = None
+        self.db_core.results = []
+        buffer = io.StringIO()
+        self.output.capture(buffer)
+        start = time.perf_counter()
+        try:
+            action, args = parse_command(command)
+            if action in ("LOGIN", "SU"):
+                running = self.login(args)
+            elif self.user.user is None and action not in ("QUIT", "EXIT", "HELP"):
+                self.error = PermissionError("Authentification requise : LOGIN <utilisateur> <mot de passe>")
+                running = True
+            else:
+                running = execute_command(action, args, self)
+            if self.timing and action != "\\TIMING":
+                print(f"Temps : {(time.perf_counter() - start) * 1000:.3f} ms")
+        finally:
+            self.output.capture(None)
+
+        response = {
+            "ok": self.error is None,
+            "results": self.db_core.results,
+            "messages": buffer.getvalue().splitlines(),
+        }
+        if self.error is not None:
+            response["error"] = str(self.error)
+        return response, running
+
+    def login(self, args: list) -> bool:
+        if len(args) != 2 or not self.user.valid_user(args[0], args[1]):
+            self.error = PermissionError("Utilisateur ou mot de passe incorrect.")
+            return True
+
+        self.user.user = args[0]
+        self.user.user_permission = self.user.get_permission(args[0])
+        if self.db_core.CURRENT_DB:
+            self.permission = get_perms(self)
+        print(f"Connecté en tant que {self.user.user}")
+        return True
+
+    def close(self):
+        if self.db_core.transaction is not None:
+            self.db_core.rollback()
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, shared: DBCore, output: SessionOutput):
+    loop = asyncio.get_running_loop()
+    session = ServerSession(shared, output)
+    try:
+        running = True
+        while running:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode("utf-8").strip()
+            if not command:
+                continue
+
+            response, running = await loop.run_in_executor(session.executor, session.execute, command)
+            payload = json.dumps(response, ensure_ascii=False, default=str) + "\n"
+            writer.write(payload.encode("utf-8"))
+            await writer.drain()
+
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        await loop.run_in_executor(session.executor, session.close)
+        session.executor.shutdown(wait=False)
+        writer.close()
+
+
+async def run_server(host: str, port: int, shared: DBCore, output: SessionOutput):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(reader, writer, shared, output), host, port
+    )
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"{DB_NAME} en écoute sur {addresses}.")
+    async with server:
+        await server.serve_forever()
+
+
+def serve(host: str, port: int):
+    output = SessionOutput(sys.stdout)
+    sys.stdout = output
+    disable_fork()
+    db_core.load_db()
+    try:
+        asyncio.run(run_server(host, port, db_core, output))
+    except KeyboardInterrupt:
+        print(f"\nArrêt du serveur {DB_NAME}.")
@@ -0,0 +1,641 @@
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import weakref
+from array import array
+
+from locks import TABLE_LOCKS
+from wal import GROUP_COMMIT, TMP_SUFFIX, WriteAheadLog, fsync_directory
+
+
+SEPARATORS = re.compile(r'[\s,]*')
+
+
+class JsonStorage:
+    name = "json"
+    suffix = "_data.json"
+    appendable = False
+
+    def load(self, path: str) -> list:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if not isinstance(data, list):
+            raise TypeError("Le fichier de données JSON n'est pas une liste d'enregistrements valide.")
+
+        return data
+
+    def streamable(self, path: str) -> bool:
+        return True
+
+    def iter_rows(self, path: str, chunk_size: int = 65536):
+        decoder = json.JSONDecoder()
+        with open(path, 'r', encoding='utf-8') as f:
+            buffer = f.read(chunk_size).lstrip()
+            if not buffer.startswith('['):
+                raise TypeError("Le fichier de données JSON n'est pas une liste d'enregistrements valide.")
+
+            pos = 1
+            while True:
+                pos = SEPARATORS.match(buffer, pos).end()
+                if buffer.startswith(']', pos):
+                    return
+                try:
+                    record, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        raise
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                yield record
+
+    def prepare(self, path: str, records: list, indent: int = None) -> str:
+        tmp_path = path + TMP_SUFFIX
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if indent is None:
+                json.dump(records, f, ensure_ascii=False, separators=(',', ':'))
+            else:
+                json.dump(records, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path
+
+    def save(self, path: str, records: list):
+        os.replace(self.prepare(path, records), path)
+        fsync_directory(os.path.dirname(path))
+
+    def export(self, path: str, records: list):
+        os.replace(self.prepare(path, records, indent=4), path)
+        fsync_directory(os.path.dirname(path))
+
+    def append(self, path: str, records: list, entries: list):
+        self.save(path, records)
+
+
+BINARY_MAGIC = b"RDBB\x01"
+BINARY_HEADER = struct.Struct("<I")
+BINARY_TYPECODES = {int: 'q', float: 'd', bool: 'b'}
+INT64_MIN = -(2 ** 63)
+INT64_MAX = 2 ** 63 - 1
+
+
+class BinaryStorage:
+    name = "binary"
+    suffix = "_data.bin"
+    appendable = False
+
+    def _typecode(self, values: list):
+        kind = None
+        for value in values:
+            if value is None:
+                continue
+            value_type = type(value)
+            if value_type is int and not INT64_MIN <= value <= INT64_MAX:
+                return None
+            if kind is None:
+                kind = value_type
+            elif kind is not value_type:
+                return None
+        return BINARY_TYPECODES.get(kind)
+
+    def _encode_json(self, value) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def encode(self, records: list) -> bytes:
+        names = list(records[0]) if records else []
+        expected = set(names)
+        if not names or any(record.keys() != expected for record in records):
+            blob = self._encode_json(records)
+            header = {"rows": len(records), "size": len(blob)}
+            blobs = [blob]
+        else:
+            columns = []
+            blobs = []
+            for name in names:
+                values = [record[name] for record in records]
+                typecode = self._typecode(values)
+                if typecode is None:
+                    blob = self._encode_json(values)
+                    columns.append({"name": name, "size": len(blob)})
+                else:
+                    nulls = bytes(value is None for value in values) if None in values else b""
+                    data = array(typecode, (0 if value is None else value for value in values) if nulls else values)
+                    blob = nulls + data.tobytes()
+                    columns.append({"name": name, "type": typecode, "nulls": bool(nulls), "size": len(blob)})
+                blobs.append(blob)
+            header = {"rows": len(records), "byteorder": sys.byteorder, "columns": columns}
+
+        header = self._encode_json(header)
+        return BINARY_MAGIC + BINARY_HEADER.pack(len(header)) + header + b"".join(blobs)
+
+    def decode(self, data: bytes) -> list:
+        if not data.startswith(BINARY_MAGIC):
+            raise TypeError("Le fichier de données binaire n'est pas valide.")
+
+        offset = len(BINARY_MAGIC)
+        (size,) = BINARY_HEADER.unpack_from(data, offset)
+        offset += BINARY_HEADER.size
+        header = json.loads(data[offset:offset + size])
+        offset += size
+
+        rows = header["rows"]
+        if "columns" not in header:
+            return json.loads(data[offset:offset + header["size"]])
+
+        names = []
+        columns = []
+        for column in header["columns"]:
+            blob = data[offset:offset + column["size"]]
+            offset += column["size"]
+            typecode = column.get("type")
+            if typecode is None:
+                values = json.loads(blob)
+            else:
+                nulls = blob[:rows] if column["nulls"] else None
+                values = array(typecode)
+                values.frombytes(blob[rows:] if nulls else blob)
+                if header["byteorder"] != sys.byteorder:
+                    values.byteswap()
+                values = values.tolist()
+                if typecode == 'b':
+                    values = list(map(bool, values))
+                if nulls:
+                    values = [None if null else value for value, null in zip(values, nulls)]
+            names.append(column["name"])
+            columns.append(values)
+
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+    def load(self, path: str) -> list:
+        with open(path, 'rb') as f:
+            return self.decode(f.read())
+
+    def streamable(self, path: str) -> bool:
+        return False
+
+    def prepare(self, path: str, records: list) -> str:
+        tmp_path = path + TMP_SUFFIX
+        with open(tmp_path, 'wb') as f:
+            f.write(self.encode(records))
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path
+
+    def save(self, path: str, records: list):
+        os.replace(self.prepare(path, records), path)
+        fsync_directory(os.path.dirname(path))
+
+    def append(self, path: str, records: list, entries: list):
+        self.save(path, records)
+
+
+FIXED_MAGIC = b"RDBF\x01"
+FIXED_CODES = {int: 'q', float: 'd', bool: '?'}
+FIXED_TYPES = {'q': int, 'd': float, '?': bool}
+MASK_CODES = ((8, 'B'), (16, 'H'), (32, 'I'), (64, 'Q'))
+
+
+class FixedLayout:
+    def __init__(self, columns: list, codes: list):
+        mask = next((code for width, code in MASK_CODES if len(columns) <= width), None)
+        if mask is None:
+            raise TypeError("Le format fixed accepte au plus 64 colonnes.")
+
+        self.columns = columns
+        self.codes = codes
+        self.names = set(columns)
+        self.types = [FIXED_TYPES[code] for code in codes]
+        self.row = struct.Struct("<" + mask + "".join(codes))
+        header = json.dumps({"columns": columns, "codes": codes}, ensure_ascii=False).encode('utf-8')
+        self.prefix = FIXED_MAGIC + BINARY_HEADER.pack(len(header)) + header
+        self.offset = len(self.prefix)
+
+    @classmethod
+    def infer(cls, records: list):
+        columns = list(records[0]) if records else []
+        expected = set(columns)
+        if any(record.keys() != expected for record in records):
+            raise TypeError("Le format fixed exige les mêmes colonnes pour tous les enregistrements.")
+
+        codes = []
+        for column in columns:
+            kind = None
+            for record in records:
+                value = record[column]
+                if value is None:
+                    continue
+                value_type = type(value)
+                if value_type not in FIXED_CODES or (kind is not None and kind is not value_type) \
+                        or (value_type is int and not INT64_MIN <= value <= INT64_MAX):
+                    raise TypeError(f"La colonne '{column}' ne peut pas être stockée au format fixed (integer, float ou boolean uniquement).")
+                kind = value_type
+            codes.append(FIXED_CODES[kind or int])
+        return cls(columns, codes)
+
+    @classmethod
+    def read(cls, f):
+        magic = f.read(len(FIXED_MAGIC))
+        if magic != FIXED_MAGIC:
+            raise TypeError("Le fichier de données fixed n'est pas valide.")
+        (size,) = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+        header = json.loads(f.read(size))
+        return cls(header["columns"], header["codes"])
+
+    def fits(self, record: dict) -> bool:
+        if record.keys() != self.names:
+            return False
+        for column, value_type in zip(self.columns, self.types):
+            value = record[column]
+            if value is not None and (type(value) is not value_type
+                                      or (value_type is int and not INT64_MIN <= value <= INT64_MAX)):
+                return False
+        return True
+
+    def pack(self, record: dict) -> bytes:
+        mask = 0
+        values = []
+        for i, column in enumerate(self.columns):
+            value = record[column]
+            if value is None:
+                mask |= 1 << i
+                value = 0
+            values.append(value)
+        return self.row.pack(mask, *values)
+
+    def unpack(self, buffer) -> list:
+        columns = self.columns
+        rows = list(self.row.iter_unpack(buffer))
+        records = [dict(zip(columns, row[1:])) for row in rows]
+        for record, row in zip(records, rows):
+            mask = row[0]
+            if mask:
+                for i, column in enumerate(columns):
+                    if mask >> i & 1:
+                        record[column] = None
+        return records
+
+
+class FixedStorage:
+    name = "fixed"
+    suffix = "_data.fix"
+    appendable = False
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wals = {}
+
+    def wal(self, directory: str) -> WriteAheadLog:
+        with self.lock:
+            wal = self.wals.get(directory)
+            if wal is None:
+                wal = self.wals[directory] = WriteAheadLog(directory)
+            return wal
+
+    def supports(self, schema: dict) -> bool:
+        return all(field['type'] in ('integer', 'float', 'boolean') for field in schema.get('fields', []))
+
+    def _count(self, f, layout: FixedLayout) -> tuple:
+        size = os.fstat(f.fileno()).st_size - layout.offset
+        return size // layout.row.size, size % layout.row.size
+
+    def load(self, path: str) -> list:
+        with open(path, 'rb') as f:
+            layout = FixedLayout.read(f)
+            count, torn = self._count(f, layout)
+            if torn:
+                os.truncate(path, layout.offset + count * layout.row.size)
+            if not count:
+                return []
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                with memoryview(mapping) as view:
+                    with view[layout.offset:layout.offset + count * layout.row.size] as rows:
+                        return layout.unpack(rows)
+
+    def streamable(self, path: str) -> bool:
+        return True
+
+    def iter_rows(self, path: str, chunk_rows: int = 4096):
+        with open(path, 'rb') as f:
+            layout = FixedLayout.read(f)
+            count, torn = self._count(f, layout)
+            if not count:
+                return
+
+            size = layout.row.size
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                for start in range(0, count, chunk_rows):
+                    end = min(count, start + chunk_rows)
+                    with memoryview(mapping) as view:
+                        with view[layout.offset + start * size:layout.offset + end * size] as rows:
+                            records = layout.unpack(rows)
+                    yield from records
+
+    def prepare(self, path: str, records: list) -> str:
+        layout = FixedLayout.infer(records)
+        tmp_path = path + TMP_SUFFIX
+        with open(tmp_path, 'wb') as f:
+            f.write(layout.prefix)
+            f.write(b"".join(map(layout.pack, records)))
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path
+
+    def save(self, path: str, records: list):
+        os.replace(self.prepare(path, records), path)
+        fsync_directory(os.path.dirname(path))
+
+    def append(self, path: str, records: list, entries: list):
+        if any(entry["op"] not in ("insert", "update") for entry in entries):
+            self.save(path, records)
+            return
+
+        with open(path, 'rb') as f:
+            layout = FixedLayout.read(f)
+            count, torn = self._count(f, layout)
+        updated = sorted({pos for entry in entries if entry["op"] == "update" for pos in entry["pos"] if pos < count})
+        if count > len(records) or not all(layout.fits(records[pos]) for pos in updated) \
+                or not all(map(layout.fits, records[count:])):
+            self.save(path, records)
+            return
+
+        size = layout.row.size
+        chunks = [(layout.offset + pos * size, layout.pack(records[pos])) for pos in updated]
+        if len(records) > count:
+            chunks.append((layout.offset + count * size, b"".join(map(layout.pack, records[count:]))))
+        if chunks:
+            self.wal(os.path.dirname(path)).commit([], patches=[(path, chunks)])
+        if torn:
+            os.truncate(path, layout.offset + len(records) * size)
+
+
+def apply_entry(records: list, entry: dict):
+    op = entry.get("op")
+    if op == "insert":
+        records.append(entry["row"])
+    elif op == "update":
+        changes = entry["set"]
+        for pos in entry["pos"]:
+            records[pos].update(changes)
+    elif op == "delete":
+        drop = set(entry["pos"])
+        records[:] = [record for i, record in enumerate(records) if i not in drop]
+    elif op == "truncate":
+        records.clear()
+    else:
+        raise ValueError(f"Entrée de journal inconnue : {op}")
+
+
+MARKER_SUFFIX = ".mod"
+INSERT_PREFIX = '{"op":"insert",'
+CLEAN = "clean"
+MODIFIED = "modified"
+
+
+class LogStorage:
+    name = "log"
+    suffix = "_data.jsonl"
+    appendable = True
+
+    def __init__(self, compact_min_entries: int = 1000, compact_ratio: float = 2.0, lock_timeout: float = 10.0):
+        self.compact_min_entries = compact_min_entries
+        self.compact_ratio = compact_ratio
+        self.lock_timeout = lock_timeout
+        self.lock = threading.Lock()
+        self.entry_counts = {}
+        self.compactions = {}
+        self.threads = []
+        self.listeners = []
+
+    def _encode(self, entry: dict) -> str:
+        return json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+    def load(self, path: str) -> list:
+        records = []
+        count = 0
+        good_offset = 0
+        modified = False
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    good_offset += len(line)
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    if f.read(1):
+                        raise
+                    os.truncate(path, good_offset)
+                    break
+                if not line.endswith(b"\n"):
+                    with open(path, 'ab') as tail:
+                        tail.write(b"\n")
+                if not modified and entry.get("op") != "insert":
+                    modified = True
+                apply_entry(records, entry)
+                good_offset += len(line)
+                count += 1
+
+        self._mark(path, MODIFIED if modified else CLEAN)
+        with self.lock:
+            self.entry_counts[path] = count
+        return records
+
+    def _marker_path(self, path: str) -> str:
+        return path + MARKER_SUFFIX
+
+    def _state(self, path: str):
+        try:
+            with open(self._marker_path(path), 'r', encoding='utf-8') as f:
+                inode, _, state = f.read().partition(" ")
+            return state if inode == str(os.stat(path).st_ino) else None
+        except FileNotFoundError:
+            return None
+
+    def mark(self, path: str, entries: list):
+        if any(entry.get("op") != "insert" for entry in entries):
+            self._mark(path, MODIFIED)
+
+    def _mark(self, path: str, state: str, inode: int = None):
+        if inode is None:
+            if not os.path.exists(path):
+                open(path, 'ab').close()
+            inode = os.stat(path).st_ino
+        content = f"{inode} {state}"
+        try:
+            with open(self._marker_path(path), 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    return
+        except FileNotFoundError:
+            pass
+        with open(self._marker_path(path), 'w', encoding='utf-8') as f:
+            f.write(content)
+            if state == MODIFIED:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def forget(self, path: str):
+        if os.path.exists(self._marker_path(path)):
+            os.remove(self._marker_path(path))
+
+    def streamable(self, path: str) -> bool:
+        return self._state(path) == CLEAN
+
+    def iter_rows(self, path: str):
+        count = 0
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    if f.read(1):
+                        raise
+                    return
+                if entry.get("op") != "insert":
+                    self._mark(path, MODIFIED)
+                    if count:
+                        raise ValueError("Le journal contient des modifications, lecture en flux impossible.")
+                    yield from self.load(path)
+                    return
+                count += 1
+                yield entry["row"]
+
+    def prepare(self, path: str, records: list) -> str:
+        tmp_path = path + TMP_SUFFIX
+        with self.lock:
+            self.compactions.pop(path, None)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(self._encode({"op": "insert", "row": record}))
+                f.flush()
+                os.fsync(f.fileno())
+                self._mark(path, CLEAN, os.fstat(f.fileno()).st_ino)
+            self.entry_counts[path] = len(records)
+        return tmp_path
+
+    def save(self, path: str, records: list):
+        os.replace(self.prepare(path, records), path)
+        fsync_directory(os.path.dirname(path))
+
+    def encode(self, entries: list) -> str:
+        return "".join(self._encode(entry) for entry in entries)
+
+    def append(self, path: str, records: list, entries: list):
+        payload = self.encode(entries)
+        with self.lock:
+            self.mark(path, entries)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+            GROUP_COMMIT.request(path)
+
+            pending = self.compactions.get(path)
+            if pending is not None:
+                pending.append(payload)
+            self._appended(path, records, len(entries))
+
+    def cancel_compaction(self, path: str):
+        with self.lock:
+            self.compactions.pop(path, None)
+
+    def appended(self, path: str, records: list, count: int):
+        with self.lock:
+            self._appended(path, records, count)
+
+    def _appended(self, path: str, records: list, count: int):
+        count = self.entry_counts.get(path, 0) + count
+        self.entry_counts[path] = count
+
+        threshold = max(self.compact_min_entries, self.compact_ratio * len(records))
+        if count > threshold and path not in self.compactions:
+            self._start_compaction(path, records)
+
+    def compact(self, path: str, records: list, background: bool = True):
+        with self.lock:
+            if path in self.compactions:
+                return
+            thread = self._start_compaction(path, records)
+        if not background:
+            thread.join()
+
+    def _lock_path(self, path: str) -> str:
+        return os.path.join(os.path.dirname(path), os.path.basename(path)[:-len(self.suffix)] + ".lock")
+
+    def _start_compaction(self, path: str, records: list) -> threading.Thread:
+        snapshot = [dict(record) for record in records]
+        pending = []
+        self.compactions[path] = pending
+        st = os.stat(path)
+        thread = threading.Thread(target=self._compact, args=(path, snapshot, pending, (st.st_ino, st.st_size)), daemon=True)
+        self.threads = [t for t in self.threads if t.is_alive()]
+        self.threads.append(thread)
+        thread.start()
+        return thread
+
+    def listen(self, callback):
+        with self.lock:
+            self.listeners = [ref for ref in self.listeners if ref() is not None]
+            self.listeners.append(weakref.WeakMethod(callback))
+
+    def wait(self):
+        for thread in list(self.threads):
+            thread.join()
+        GROUP_COMMIT.flush()
+
+    def _compact(self, path: str, snapshot: list, pending: list, stamp: tuple):
+        tmp_path = path + ".compact"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in snapshot:
+                    f.write(self._encode({"op": "insert", "row": record}))
+
+            table_lock = TABLE_LOCKS.get(self._lock_path(path))
+            table_lock.acquire(True, self.lock_timeout)
+            try:
+                with self.lock:
+                    st = os.stat(path)
+                    expected = stamp[1] + sum(len(chunk.encode('utf-8')) for chunk in pending)
+                    if self.compactions.get(path) is not pending or (st.st_ino, st.st_size) != (stamp[0], expected):
+                        if self.compactions.get(path) is pending:
+                            del self.compactions[path]
+                        os.remove(tmp_path)
+                        return
+                    with open(tmp_path, 'a', encoding='utf-8') as f:
+                        f.write("".join(pending))
+                        f.flush()
+                        os.fsync(f.fileno())
+                        modified = any(not line.startswith(INSERT_PREFIX) for chunk in pending for line in chunk.splitlines())
+                        self._mark(path, MODIFIED if modified else CLEAN, os.fstat(f.fileno()).st_ino)
+                    os.replace(tmp_path, path)
+                    fsync_directory(os.path.dirname(path))
+                    self.entry_counts[path] = len(snapshot) + sum(chunk.count("\n") for chunk in pending)
+                    del self.compactions[path]
+                    for ref in self.listeners:
+                        listener = ref()
+                        if listener is not None:
+                            listener(path)
+            finally:
+                table_lock.release(True)
+
+        except Exception as e:
+            print(f"Erreur lors du compactage du journal '{path}' : {e}")
+            with self.lock:
+                if self.compactions.get(path) is pending:
+                    del self.compactions[path]
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+STORAGE_ENGINES = {
+    JsonStorage.name: JsonStorage(),
+    LogStorage.name: LogStorage(),
+    BinaryStorage.name: BinaryStorage(),
+    FixedStorage.name: FixedStorage(),
+}
@@ -0,0 +1,109 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class CacheEntry:
+    def __init__(self, records: list, stamp: tuple):
+        self.records = records
+        self.stamp = stamp
+        self.size = stamp[1]
+        self.indexes = {}
+        self.columnar = None
+
+
+class TableCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+
+    def _stamp(self, path: str) -> tuple:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, path: str):
+        with self.lock:
+            entry = self.lookup(path)
+            if entry is None:
+                return None
+
+            if entry.records is None:
+                entry.records = entry.columnar.to_records()
+                entry.columnar = None
+            return entry.records
+
+    def lookup(self, path: str):
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                return None
+
+            try:
+                stamp = self._stamp(path)
+            except FileNotFoundError:
+                self.invalidate(path)
+                return None
+
+            if stamp != entry.stamp:
+                self.invalidate(path)
+                return None
+
+            self.entries.move_to_end(path)
+            return entry
+
+    def entry(self, path: str):
+        return self.entries.get(path)
+
+    def put(self, path: str, records: list):
+        with self.lock:
+            previous = self.entries.get(path)
+            self.invalidate(path)
+            try:
+                stamp = self._stamp(path)
+            except FileNotFoundError:
+                return
+
+            entry = CacheEntry(records, stamp)
+            if entry.size > self.max_bytes:
+                return
+
+            if previous is not None and previous.records is records:
+                entry.indexes = previous.indexes
+
+            self.entries[path] = entry
+            self.total_bytes += entry.size
+            self._evict()
+
+    def refresh(self, path: str):
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                return
+
+            try:
+                entry.stamp = self._stamp(path)
+            except FileNotFoundError:
+                self.invalidate(path)
+                return
+
+            self.total_bytes += entry.stamp[1] - entry.size
+            entry.size = entry.stamp[1]
+            self._evict()
+
+    def invalidate(self, path: str):
+        with self.lock:
+            entry = self.entries.pop(path, None)
+            if entry is not None:
+                self.total_bytes -= entry.size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.size
@@ -0,0 +1,44 @@
+import os
+
+
+class TableChanges:
+    def __init__(self, table_name: str, storage, records: list):
+        self.table_name = table_name
+        self.storage = storage
+        self.records = records
+        self.entries = []
+        self.rewrite = not storage.appendable
+
+    def record(self, records: list, entries: list):
+        self.records = records
+        if not self.rewrite:
+            self.entries.extend(entries)
+
+    def replace(self, records: list):
+        self.records = records
+        self.rewrite = True
+        self.entries = []
+
+
+class Transaction:
+    def __init__(self):
+        self.tables = {}
+        self.locks = []
+
+    def changes(self, data_path: str):
+        return self.tables.get(data_path)
+
+    def touch(self, data_path: str, table_name: str, storage, records: list) -> TableChanges:
+        changes = self.tables.get(data_path)
+        if changes is None:
+            changes = self.tables[data_path] = TableChanges(table_name, storage, records)
+        return changes
+
+    def discard(self, data_path: str):
+        self.tables.pop(data_path, None)
+
+    def by_directory(self, first: str = None) -> list:
+        groups = {}
+        for data_path, changes in self.tables.items():
+            groups.setdefault(os.path.dirname(data_path), []).append((data_path, changes))
+        return sorted(groups.items(), key=lambda item: item[0] != first)
@@ -0,0 +1,163 @@
+import atexit
+import base64
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from locks import TABLE_LOCKS
+
+
+TMP_SUFFIX = ".tmp"
+
+
+def fsync_file(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_directory(path: str):
+    try:
+        fsync_file(path)
+    except (PermissionError, IsADirectoryError, OSError):
+        pass
+
+
+class GroupCommit:
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.dirty = set()
+        self.last_flush = 0.0
+        self.timer = None
+        atexit.register(self.flush)
+
+    def request(self, path: str):
+        with self.lock:
+            self.dirty.add(path)
+            if time.monotonic() - self.last_flush < self.interval:
+                if self.timer is None:
+                    self.timer = threading.Timer(self.interval, self.flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            self.last_flush = time.monotonic()
+
+        for path in dirty:
+            try:
+                fsync_file(path)
+            except FileNotFoundError:
+                pass
+
+
+GROUP_COMMIT = GroupCommit()
+
+
+def _patch(path: str, chunks: list):
+    with open(path, 'r+b') as f:
+        for offset, data in chunks:
+            f.seek(offset)
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class WriteAheadLog:
+    def __init__(self, directory: str, filename: str = "wal.log", timeout: float = 10.0):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.lock = TABLE_LOCKS.get(os.path.join(directory, "wal.lock"))
+        self.timeout = timeout
+        self.recovered = False
+
+    @contextmanager
+    def _locked(self):
+        self.lock.acquire(True, self.timeout)
+        try:
+            yield
+        finally:
+            self.lock.release(True)
+
+    def commit(self, replacements: list, appends: list = (), patches: list = ()):
+        if not replacements and not appends and not patches:
+            return
+
+        with self._locked():
+            entry = {
+                "op": "commit",
+                "files": [[os.path.basename(tmp_path), os.path.basename(path)] for tmp_path, path in replacements],
+                "appends": [
+                    [os.path.basename(path), os.path.getsize(path) if os.path.exists(path) else 0, payload]
+                    for path, payload in appends
+                ],
+                "patches": [
+                    [os.path.basename(path), [[offset, base64.b64encode(data).decode('ascii')] for offset, data in chunks]]
+                    for path, chunks in patches
+                ],
+            }
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            for path, payload in appends:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+            for path, chunks in patches:
+                _patch(path, chunks)
+            for tmp_path, path in replacements:
+                os.replace(tmp_path, path)
+            fsync_directory(self.directory)
+            self._checkpoint()
+
+    def _checkpoint(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            os.fsync(f.fileno())
+
+    def recover(self) -> int:
+        with self._locked():
+            self.recovered = True
+            if not os.path.exists(self.path):
+                return 0
+
+            replayed = 0
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    for name, offset, payload in entry.get("appends", []):
+                        path = os.path.join(self.directory, name)
+                        with open(path, 'a+b') as data:
+                            data.truncate(offset)
+                            data.write(payload.encode('utf-8'))
+                            data.flush()
+                            os.fsync(data.fileno())
+                        replayed += 1
+                    for name, chunks in entry.get("patches", []):
+                        _patch(os.path.join(self.directory, name), [(offset, base64.b64decode(data)) for offset, data in chunks])
+                        replayed += 1
+                    for tmp_name, name in entry.get("files", []):
+                        tmp_path = os.path.join(self.directory, tmp_name)
+                        if os.path.exists(tmp_path):
+                            os.replace(tmp_path, os.path.join(self.directory, name))
+                            replayed += 1
+
+            fsync_directory(self.directory)
+            self._checkpoint()
+            return replayed